@@ -0,0 +1,359 @@
+import sys
+import os
+import json
+import time
+import asyncio
+import argparse
+import threading
+from collections import OrderedDict
+from urllib.parse import urlparse, parse_qs
+
+import main
+
+API_HOST = "127.0.0.1"
+API_PORT = 8765
+API_MAX_PENDING_JOBS = 10000
+API_MAX_BODY_BYTES = 16 * 1024 * 1024
+API_RETRY_AFTER_SECONDS = 30
+API_PROGRESS_INTERVAL = 0.5
+API_FINISHED_SUBMISSIONS_KEPT = 200
+API_EVENT_QUEUE_SIZE = 1000
+SUPPORTED_FORMATS = ["mp3", "wav", "flac", "m4a", "mp4", "mkv"]
+
+HTTP_REASONS = {
+    200: "OK",
+    202: "Accepted",
+    400: "Bad Request",
+    404: "Not Found",
+    405: "Method Not Allowed",
+    413: "Payload Too Large",
+    429: "Too Many Requests"
+}
+
+submissions = OrderedDict()
+submissions_lock = threading.Lock()
+submission_queue = None
+next_submission_id = 1
+pending_job_count = 0
+max_pending_jobs = API_MAX_PENDING_JOBS
+
+api_loop = None
+event_subscribers = {}
+last_progress_event = {}
+
+class Submission:
+    """One POST /jobs request; its URLs run as a single run_download_jobs_async call with its own format settings"""
+
+    def __init__(self, submission_id, urls, output_format, quality, destination, playlist):
+        self.id = submission_id
+        self.urls = urls
+        self.output_format = output_format
+        self.quality = quality
+        self.destination = destination
+        self.playlist = playlist
+        self.status = "queued"
+        self.error = None
+        self.jobs = []
+        self.reserved_jobs = len(urls)
+        self.expanded_jobs = 0
+        self.created_at = time.time()
+
+    def describe(self, include_jobs=False):
+        counts = main.count_jobs(self.jobs)
+        summary = {
+            'id': self.id,
+            'status': self.status,
+            'format': self.output_format,
+            'quality': self.quality,
+            'destination': self.destination,
+            'urls': len(self.urls),
+            'jobs': len(self.jobs),
+            'counts': counts,
+            'error': self.error,
+            'created_at': round(self.created_at, 3)
+        }
+        if include_jobs:
+            with main.job_state_lock:
+                summary['jobs'] = [describe_job(job) for job in self.jobs]
+        return summary
+
+def describe_job(job):
+    return {
+        'index': job.index,
+        'url': job.url,
+        'status': job.status,
+        'progress': round(job.progress, 3),
+        'file_size_mb': job.file_size_mb,
+        'error': job.error
+    }
+
+def publish_event(payload):
+    if api_loop is not None:
+        api_loop.call_soon_threadsafe(broadcast_event, payload)
+
+def broadcast_event(payload):
+    for subscriber, submission_filter in list(event_subscribers.items()):
+        if submission_filter is not None and payload.get('submission') != submission_filter:
+            continue
+        try:
+            subscriber.put_nowait(payload)
+        except asyncio.QueueFull:
+            # The client is not keeping up; drop what it has not read and close its stream
+            event_subscribers.pop(subscriber, None)
+            while not subscriber.empty():
+                subscriber.get_nowait()
+            subscriber.put_nowait(None)
+
+def on_ui_event(event, value):
+    if event == 'status':
+        publish_event({'event': 'status', 'text': value})
+    elif event == 'job':
+        publish_event(dict(describe_job(value), event='job', submission=getattr(value, 'submission_id', None)))
+    elif event == 'job_progress':
+        now = time.time()
+        progress_key = (getattr(value, 'submission_id', None), value.index)
+        if now - last_progress_event.get(progress_key, 0) >= API_PROGRESS_INTERVAL:
+            last_progress_event[progress_key] = now
+            publish_event({
+                'event': 'progress',
+                'submission': progress_key[0],
+                'index': value.index,
+                'url': value.url,
+                'progress': round(value.progress, 3)
+            })
+
+def tag_jobs(submission, jobs):
+    """Tag expanded jobs with their submission and grow its share of the pending job count;
+    playlist expansion stops once the pending limit is reached"""
+    global pending_job_count
+    for job in jobs:
+        job.submission_id = submission.id
+        if job.status != "skipped":
+            with submissions_lock:
+                submission.expanded_jobs += 1
+                if submission.expanded_jobs > submission.reserved_jobs:
+                    if pending_job_count >= max_pending_jobs:
+                        submission.error = f"Stopped after {submission.expanded_jobs - 1} jobs: pending job limit of {max_pending_jobs} reached"
+                        print(f"Submission {submission.id}: {submission.error}")
+                        return
+                    submission.reserved_jobs += 1
+                    pending_job_count += 1
+        yield job
+
+async def run_submission(submission):
+    global pending_job_count
+    submission.status = "running"
+    publish_event({'event': 'submission', 'submission': submission.id, 'status': submission.status})
+
+    try:
+        os.makedirs(submission.destination, exist_ok=True)
+        completed = await main.run_download_jobs_async(
+            submission.jobs,
+            main.get_ffmpeg_path(),
+            kind="api",
+            source=f"submission {submission.id}",
+            job_source=tag_jobs(submission, main.generate_url_jobs(submission.urls, submission.output_format, submission.playlist)),
+            output_format=submission.output_format,
+            quality=submission.quality,
+            output_folder=submission.destination
+        )
+        submission.status = "finished" if completed else "cancelled"
+    except Exception as e:
+        print(f"Error running submission {submission.id}: {e}")
+        submission.status = "failed"
+        submission.error = str(e)
+
+    with submissions_lock:
+        pending_job_count -= submission.reserved_jobs
+        finished = [s for s in submissions.values() if s.status in ["finished", "cancelled", "failed"]]
+        for old_submission in finished[:-API_FINISHED_SUBMISSIONS_KEPT]:
+            submissions.pop(old_submission.id, None)
+
+    publish_event({'event': 'submission', 'submission': submission.id, 'status': submission.status})
+
+async def dispatch_submissions():
+    while True:
+        submission = await submission_queue.get()
+        await run_submission(submission)
+
+def submit_jobs(request):
+    """Validate a POST /jobs body and queue it; returns (http_status, response, extra_headers)"""
+    global next_submission_id, pending_job_count
+    urls = request.get('urls')
+    if urls is None and request.get('url'):
+        urls = [request['url']]
+    if not isinstance(urls, list) or not urls or not all(isinstance(url, str) and url.strip() for url in urls):
+        return 400, {'error': "'urls' must be a non-empty list of URLs"}, {}
+    urls = [url.strip() for url in urls]
+
+    output_format = request.get('format', main.current_format)
+    if output_format not in SUPPORTED_FORMATS:
+        return 400, {'error': f"'format' must be one of {', '.join(SUPPORTED_FORMATS)}"}, {}
+
+    quality = str(request.get('quality', main.current_quality))
+    destination = os.path.abspath(os.path.expanduser(request.get('destination') or main.current_download_folder))
+    playlist = bool(request.get('playlist', main.is_playlist_mode))
+
+    with submissions_lock:
+        # Every URL is at least one job; playlists reserve more as they expand (see tag_jobs)
+        if pending_job_count + len(urls) > max_pending_jobs:
+            return 429, {
+                'error': "Too many pending jobs, try again later",
+                'pending': pending_job_count,
+                'limit': max_pending_jobs
+            }, {'Retry-After': str(API_RETRY_AFTER_SECONDS)}
+
+        submission = Submission(next_submission_id, urls, output_format, quality, destination, playlist)
+        next_submission_id += 1
+        pending_job_count += len(urls)
+        submissions[submission.id] = submission
+
+    submission_queue.put_nowait(submission)
+    return 202, {'submission': submission.id, 'queued': len(urls), 'pending': pending_job_count}, {}
+
+async def send_response(writer, status, payload, extra_headers=None):
+    body = json.dumps(payload, ensure_ascii=False).encode('utf-8')
+    headers = {
+        'Content-Type': 'application/json; charset=utf-8',
+        'Content-Length': str(len(body)),
+        'Connection': 'close'
+    }
+    headers.update(extra_headers or {})
+    head = f"HTTP/1.1 {status} {HTTP_REASONS.get(status, '')}\r\n"
+    head += "".join(f"{name}: {value}\r\n" for name, value in headers.items())
+    writer.write(head.encode('latin-1') + b"\r\n" + body)
+    await writer.drain()
+
+async def stream_events(writer, submission_filter):
+    subscriber = asyncio.Queue(maxsize=API_EVENT_QUEUE_SIZE)
+    event_subscribers[subscriber] = submission_filter
+    writer.write(
+        b"HTTP/1.1 200 OK\r\n"
+        b"Content-Type: text/event-stream\r\n"
+        b"Cache-Control: no-cache\r\n"
+        b"Connection: close\r\n\r\n"
+    )
+    try:
+        await writer.drain()
+        while True:
+            payload = await subscriber.get()
+            if payload is None:
+                break
+            writer.write(f"event: {payload['event']}\ndata: {json.dumps(payload, ensure_ascii=False)}\n\n".encode('utf-8'))
+            await writer.drain()
+    except (ConnectionError, asyncio.CancelledError):
+        pass
+    finally:
+        event_subscribers.pop(subscriber, None)
+
+async def handle_request(method, path, query, body, writer):
+    parts = [part for part in path.split('/') if part]
+
+    if parts == ['jobs'] and method == 'POST':
+        try:
+            request = json.loads(body or b'{}')
+        except ValueError:
+            await send_response(writer, 400, {'error': "Body must be JSON"})
+            return
+        if not isinstance(request, dict):
+            await send_response(writer, 400, {'error': "Body must be a JSON object"})
+            return
+        status, payload, headers = submit_jobs(request)
+        await send_response(writer, status, payload, headers)
+
+    elif parts == ['jobs'] and method == 'GET':
+        with submissions_lock:
+            listed = [submission.describe() for submission in submissions.values()]
+        await send_response(writer, 200, {'pending': pending_job_count, 'limit': max_pending_jobs, 'submissions': listed})
+
+    elif len(parts) == 2 and parts[0] == 'jobs' and method == 'GET':
+        submission = submissions.get(int(parts[1])) if parts[1].isdigit() else None
+        if submission is None:
+            await send_response(writer, 404, {'error': "Unknown submission"})
+        else:
+            await send_response(writer, 200, submission.describe(include_jobs=True))
+
+    elif parts == ['events'] and method == 'GET':
+        submission_filter = query.get('submission', [None])[0]
+        await stream_events(writer, int(submission_filter) if submission_filter and submission_filter.isdigit() else None)
+
+    elif parts and parts[0] in ['jobs', 'events']:
+        await send_response(writer, 405, {'error': "Method not allowed"})
+
+    else:
+        await send_response(writer, 404, {'error': "Not found"})
+
+async def handle_connection(reader, writer):
+    try:
+        request_line = await reader.readline()
+        method, target, _ = request_line.decode('latin-1').split(' ', 2)
+
+        headers = {}
+        while True:
+            line = await reader.readline()
+            if line in [b'\r\n', b'\n', b'']:
+                break
+            name, _, value = line.decode('latin-1').partition(':')
+            headers[name.strip().lower()] = value.strip()
+
+        content_length = int(headers.get('content-length', 0))
+        if content_length > API_MAX_BODY_BYTES:
+            await send_response(writer, 413, {'error': f"Body larger than {API_MAX_BODY_BYTES} bytes"})
+            return
+        body = await reader.readexactly(content_length) if content_length else b''
+
+        parsed = urlparse(target)
+        await handle_request(method.upper(), parsed.path, parse_qs(parsed.query), body, writer)
+    except (ValueError, asyncio.IncompleteReadError):
+        try:
+            await send_response(writer, 400, {'error': "Malformed request"})
+        except ConnectionError:
+            pass
+    except ConnectionError:
+        pass
+    except Exception as e:
+        print(f"API request error: {e}")
+    finally:
+        writer.close()
+
+async def serve(host, port):
+    global api_loop, submission_queue
+    api_loop = asyncio.get_running_loop()
+    submission_queue = asyncio.Queue()
+    dispatcher = asyncio.create_task(dispatch_submissions())
+    server = await asyncio.start_server(handle_connection, host, port)
+    print(f"Job API listening on http://{host}:{port}")
+    async with server:
+        await asyncio.gather(server.serve_forever(), dispatcher)
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Local HTTP job API for ytxtract; no GUI is created")
+    parser.add_argument('--host', default=API_HOST, help=f"address to bind (default {API_HOST})")
+    parser.add_argument('--port', type=int, default=API_PORT, help=f"port to listen on (default {API_PORT})")
+    parser.add_argument('--max-pending', type=int, default=API_MAX_PENDING_JOBS, help="pending jobs (playlist entries included) accepted before answering 429")
+    parser.add_argument('-j', '--concurrency', type=int, help="simultaneous downloads")
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    global max_pending_jobs
+    args = parse_args(argv)
+
+    main.load_settings_from_file()
+    main.load_download_stats()
+    main.load_download_history()
+    main.show_resolution_popup = False
+    main.show_audio_quality_popup = False
+    if args.concurrency:
+        main.max_concurrent_downloads = max(1, args.concurrency)
+    max_pending_jobs = max(1, args.max_pending)
+
+    main.add_ui_event_listener(on_ui_event)
+
+    try:
+        asyncio.run(serve(args.host, args.port))
+    except KeyboardInterrupt:
+        pass
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -0,0 +1,127 @@
+import sys
+import os
+import json
+import time
+import argparse
+import threading
+
+import main
+
+PROGRESS_REPORT_INTERVAL = 1.0
+
+output_lock = threading.Lock()
+json_output = None
+last_progress_report = {}
+
+def emit(event, **fields):
+    with output_lock:
+        if json_output:
+            fields['event'] = event
+            fields['time'] = round(time.time(), 3)
+            json_output.write(json.dumps(fields, ensure_ascii=False) + "\n")
+            json_output.flush()
+        elif event == 'status':
+            print(fields['text'])
+        elif event == 'progress':
+            print(f"  {fields['index'] + 1}. {fields['fraction']:.0%}")
+        elif event == 'job':
+            print(fields['line'])
+        elif event == 'summary':
+            print(f"Finished: {fields['done']} done, {fields['failed']} failed, {fields['skipped']} skipped, {fields['total_size_mb']:.1f} MB")
+
+def on_ui_event(event, value):
+    if event == 'status':
+        emit('status', text=value)
+    elif event == 'job_progress':
+        now = time.time()
+        if now - last_progress_report.get(value.index, 0) >= PROGRESS_REPORT_INTERVAL:
+            last_progress_report[value.index] = now
+            emit('progress', index=value.index, url=value.url, fraction=round(value.progress, 3))
+    elif event == 'job':
+        emit('job', index=value.index, url=value.url, status=value.status,
+             file_size_mb=value.file_size_mb, error=value.error, line=value.describe())
+
+def parse_args(argv):
+    parser = argparse.ArgumentParser(description="Headless ytxtract downloader; no GUI is created")
+    parser.add_argument('urls', nargs='*', help="YouTube video or playlist URLs")
+    parser.add_argument('-i', '--input', help="read URLs from a file, one per line ('-' for stdin)")
+    parser.add_argument('-f', '--format', choices=["mp3", "wav", "flac", "m4a", "mp4", "mkv"], help="output format")
+    parser.add_argument('-q', '--quality', help="audio bitrate in kbps, e.g. 192")
+    parser.add_argument('-o', '--output', help="download folder")
+    parser.add_argument('-j', '--concurrency', type=int, help="simultaneous downloads")
+    parser.add_argument('--playlist', action='store_true', help="download every video of playlist URLs")
+    parser.add_argument('--sync', action='store_true', help="only download playlist entries added since the last sync")
+    parser.add_argument('--pipeline', action='store_true', help="convert while the next videos download")
+    parser.add_argument('--limit-rate', type=int, help="bandwidth cap for all downloads in MB/s (0 = unlimited)")
+    parser.add_argument('--no-skip', action='store_true', help="download again even if already in the download archive")
+    parser.add_argument('--json', action='store_true', help="print one JSON event per line on stdout")
+    return parser.parse_args(argv)
+
+def run(argv=None):
+    global json_output
+    args = parse_args(argv)
+
+    if args.json:
+        json_output = sys.stdout
+        sys.stdout = sys.stderr
+
+    main.load_settings_from_file()
+    main.load_download_stats()
+    main.load_download_history()
+    main.show_resolution_popup = False
+    main.show_audio_quality_popup = False
+
+    if args.format:
+        main.current_format = args.format
+    if args.quality:
+        main.current_quality = args.quality
+    if args.output:
+        main.current_download_folder = os.path.abspath(args.output)
+    if args.concurrency:
+        main.max_concurrent_downloads = max(1, args.concurrency)
+    if args.playlist or args.sync:
+        main.is_playlist_mode = True
+    if args.sync:
+        main.playlist_sync_mode = True
+    if args.pipeline:
+        main.pipeline_mode = True
+    if args.limit_rate is not None:
+        main.bandwidth_limit_mb = max(0, args.limit_rate)
+        main.bandwidth_limiter.set_limit(main.bandwidth_limit_mb * 1024 * 1024)
+    if args.no_skip:
+        main.skip_archived_downloads = False
+
+    urls = list(args.urls)
+    if args.input:
+        try:
+            if args.input == '-':
+                urls.extend(main.parse_batch_urls(sys.stdin.read()))
+            else:
+                with open(args.input, 'r', encoding='utf-8') as f:
+                    urls.extend(main.parse_batch_urls(f.read()))
+        except Exception as e:
+            print(f"Error reading URLs: {e}", file=sys.stderr)
+            return 2
+
+    if not urls:
+        print("No URLs given", file=sys.stderr)
+        return 2
+
+    os.makedirs(main.current_download_folder, exist_ok=True)
+    main.add_ui_event_listener(on_ui_event)
+
+    jobs = []
+    completed = main.run_download_jobs(jobs, main.get_ffmpeg_path(), kind="cli", source=" ".join(urls), job_source=main.generate_url_jobs(urls))
+
+    counts = main.count_jobs(jobs)
+    total_size_mb = sum(job.file_size_mb for job in jobs)
+    emit('summary', done=counts['done'], failed=counts['failed'], skipped=counts['skipped'],
+         cancelled=counts['cancelled'], total_size_mb=total_size_mb)
+
+    main.get_job_journal().flush()
+    if not completed or counts['failed']:
+        return 1
+    return 0
+
+if __name__ == "__main__":
+    sys.exit(run())
@@ -1,33 +1,111 @@
 import sys
 import os
-import yt_dlp
-import customtkinter as tk
-import threading
 import time
+
+startup_started_at = time.perf_counter()
+
+import importlib
+import asyncio
+import functools
+import threading
+import atexit
+from concurrent.futures import ThreadPoolExecutor, Future
 import tempfile
 import shutil
 import subprocess
-from tkinter import filedialog, messagebox
 import json
+import hashlib
+import sqlite3
 from datetime import datetime
 import re
+import copy
+from contextlib import contextmanager
+from collections import OrderedDict
 from urllib.parse import urlparse, parse_qs
-import tkinter as tkinter_root
 
 current_quality = "192"
 current_format = "mp3"
 current_download_folder = os.path.expanduser("~/Downloads")
 preserve_metadata = True
-download_history = []
-download_stats = {"total_downloads": 0, "total_size_mb": 0, "total_time_saved": 0}
 is_playlist_mode = False
 
 batch_mode = False
 clipboard_monitoring = False
 download_queue = []
-current_download_index = 0
 show_resolution_popup = False
 show_audio_quality_popup = False
+max_concurrent_downloads = 3
+pipeline_mode = False
+concurrent_fragment_downloads = 4
+http_chunk_size_mb = 10
+buffer_size_kb = 64
+bandwidth_limit_mb = 0
+skip_archived_downloads = True
+playlist_sync_mode = False
+
+class LazyModule:
+    """Stand-in for a heavy module that is imported on first attribute access"""
+    
+    def __init__(self, name):
+        self.name = name
+        self.module = None
+    
+    def load(self):
+        if self.module is None:
+            self.module = importlib.import_module(self.name)
+        return self.module
+    
+    def __getattr__(self, attribute):
+        return getattr(self.load(), attribute)
+
+yt_dlp = LazyModule("yt_dlp")
+
+STARTUP_TIMING_HISTORY = 100
+
+startup_timings = []
+
+def mark_startup_phase(phase):
+    startup_timings.append((phase, time.perf_counter()))
+
+def report_startup_timings():
+    """Print how long each startup phase took and keep the recent reports in startup_timings.jsonl"""
+    phases = {}
+    previous_mark = startup_started_at
+    for phase, mark in startup_timings:
+        phases[phase] = round((mark - previous_mark) * 1000, 1)
+        previous_mark = mark
+    total_ms = round((previous_mark - startup_started_at) * 1000, 1)
+    
+    print("Startup timings: " + ", ".join(f"{phase} {ms} ms" for phase, ms in phases.items()) + f" (total {total_ms} ms)")
+    
+    try:
+        timings_file = os.path.join(get_app_data_dir(), "startup_timings.jsonl")
+        lines = []
+        if os.path.exists(timings_file):
+            with open(timings_file, 'r', encoding='utf-8') as f:
+                lines = f.read().splitlines()
+        lines.append(json.dumps({
+            'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S"),
+            'phases': phases,
+            'total_ms': total_ms
+        }))
+        with open(timings_file, 'w', encoding='utf-8') as f:
+            f.write("\n".join(lines[-STARTUP_TIMING_HISTORY:]) + "\n")
+    except Exception as e:
+        print(f"Error saving startup timings: {e}")
+
+def warm_up_yt_dlp():
+    started_at = time.perf_counter()
+    try:
+        yt_dlp.load()
+        print(f"yt-dlp loaded in the background in {(time.perf_counter() - started_at) * 1000:.0f} ms")
+    except Exception as e:
+        print(f"Error loading yt-dlp: {e}")
+
+def on_first_frame():
+    mark_startup_phase("first_frame")
+    report_startup_timings()
+    threading.Thread(target=warm_up_yt_dlp, daemon=True).start()
 
 def get_ffmpeg_path():
     if getattr(sys, 'frozen', False):
@@ -58,7 +136,15 @@ def save_settings_to_file():
             'batch_mode': batch_mode,
             'clipboard_monitoring': clipboard_monitoring,
             'show_resolution_popup': show_resolution_popup,
-            'show_audio_quality_popup': show_audio_quality_popup
+            'show_audio_quality_popup': show_audio_quality_popup,
+            'max_concurrent_downloads': max_concurrent_downloads,
+            'pipeline_mode': pipeline_mode,
+            'concurrent_fragment_downloads': concurrent_fragment_downloads,
+            'http_chunk_size_mb': http_chunk_size_mb,
+            'buffer_size_kb': buffer_size_kb,
+            'bandwidth_limit_mb': bandwidth_limit_mb,
+            'skip_archived_downloads': skip_archived_downloads,
+            'playlist_sync_mode': playlist_sync_mode
         }
         with open(settings_file, 'w') as f:
             json.dump(settings, f, indent=2)
@@ -68,7 +154,9 @@ def save_settings_to_file():
 
 def load_settings_from_file():
     global current_quality, current_format, current_download_folder, preserve_metadata, is_playlist_mode
-    global batch_mode, clipboard_monitoring, show_resolution_popup, show_audio_quality_popup
+    global batch_mode, clipboard_monitoring, show_resolution_popup, show_audio_quality_popup, max_concurrent_downloads
+    global pipeline_mode, concurrent_fragment_downloads, http_chunk_size_mb, buffer_size_kb, skip_archived_downloads, playlist_sync_mode
+    global bandwidth_limit_mb
     try:
         app_data_dir = get_app_data_dir()
         settings_file = os.path.join(app_data_dir, "settings.json")
@@ -85,6 +173,15 @@ def load_settings_from_file():
             clipboard_monitoring = settings.get('clipboard_monitoring', False)
             show_resolution_popup = settings.get('show_resolution_popup', False)
             show_audio_quality_popup = settings.get('show_audio_quality_popup', False)
+            max_concurrent_downloads = settings.get('max_concurrent_downloads', 3)
+            pipeline_mode = settings.get('pipeline_mode', False)
+            concurrent_fragment_downloads = settings.get('concurrent_fragment_downloads', 4)
+            http_chunk_size_mb = settings.get('http_chunk_size_mb', 10)
+            buffer_size_kb = settings.get('buffer_size_kb', 64)
+            bandwidth_limit_mb = settings.get('bandwidth_limit_mb', 0)
+            bandwidth_limiter.set_limit(bandwidth_limit_mb * 1024 * 1024)
+            skip_archived_downloads = settings.get('skip_archived_downloads', True)
+            playlist_sync_mode = settings.get('playlist_sync_mode', False)
             print("Settings loaded from file")
     except Exception as e:
         print(f"Error loading settings: {e}")
@@ -97,37 +194,45 @@ def hide_console_window():
         return startupinfo
     return None
 
-clipboard_monitor_thread = None
+CLIPBOARD_POLL_INTERVAL_MS = 1000
+
+clipboard_poll_id = None
 clipboard_monitor_running = False
 last_clipboard_content = ""
 
 def start_clipboard_monitoring():
-    global clipboard_monitor_thread, clipboard_monitor_running
+    global clipboard_poll_id, clipboard_monitor_running
     if not clipboard_monitor_running:
         clipboard_monitor_running = True
-        clipboard_monitor_thread = threading.Thread(target=clipboard_monitor_worker, daemon=True)
-        clipboard_monitor_thread.start()
+        clipboard_poll_id = app.after(CLIPBOARD_POLL_INTERVAL_MS, poll_clipboard)
         print("Clipboard monitoring started")
 
 def stop_clipboard_monitoring():
-    global clipboard_monitor_running
+    global clipboard_poll_id, clipboard_monitor_running
     clipboard_monitor_running = False
+    if clipboard_poll_id is not None:
+        app.after_cancel(clipboard_poll_id)
+        clipboard_poll_id = None
     print("Clipboard monitoring stopped")
 
-def clipboard_monitor_worker():
-    global last_clipboard_content
-    while clipboard_monitor_running:
-        try:
-            current_clipboard = app.clipboard_get()
-            if (current_clipboard != last_clipboard_content and 
-                current_clipboard and 
-                ('youtube.com' in current_clipboard or 'youtu.be' in current_clipboard)):
-                
-                last_clipboard_content = current_clipboard
-                app.after(0, lambda: auto_paste_url(current_clipboard))
-        except Exception:
-            pass
-        time.sleep(1)
+def poll_clipboard():
+    """Check the clipboard for a new YouTube URL; reschedules itself on the Tk thread"""
+    global clipboard_poll_id, last_clipboard_content
+    if not clipboard_monitor_running:
+        return
+    
+    try:
+        current_clipboard = app.clipboard_get()
+        if (current_clipboard != last_clipboard_content and 
+            current_clipboard and 
+            ('youtube.com' in current_clipboard or 'youtu.be' in current_clipboard)):
+            
+            last_clipboard_content = current_clipboard
+            auto_paste_url(current_clipboard)
+    except Exception:
+        pass
+    
+    clipboard_poll_id = app.after(CLIPBOARD_POLL_INTERVAL_MS, poll_clipboard)
 
 def auto_paste_url(url):
     current_text = textbox.get("0.0", "end-1c").strip()
@@ -138,6 +243,7 @@ def auto_paste_url(url):
         textbox.insert("0.0", url)
         textbox.configure(border_color=("#238636", "#238636"))
         status_label.configure(text="✅ YouTube URL auto-detected!")
+        prefetch_pasted_urls(url)
 
 def parse_batch_urls(text):
     urls = []
@@ -148,52 +254,609 @@ def parse_batch_urls(text):
             urls.append(line)
     return urls
 
-def process_batch_downloads(urls):
-    global download_queue, current_download_index
-    download_queue = urls
-    current_download_index = 0
+UI_REFRESH_INTERVAL_MS = 100
+
+ui_updates = {}
+ui_actions = []
+ui_updates_lock = threading.Lock()
+
+ui_event_listeners = []
+
+def add_ui_event_listener(listener):
+    """Register listener(event, value) for 'status', 'progress', 'job' and 'job_progress' events, e.g. from the headless CLI"""
+    ui_event_listeners.append(listener)
+
+def emit_ui_event(event, value):
+    for listener in ui_event_listeners:
+        try:
+            listener(event, value)
+        except Exception as e:
+            print(f"Error in UI event listener: {e}")
+
+def set_status(text):
+    """Queue a status text for the next UI refresh; safe to call from any thread"""
+    with ui_updates_lock:
+        ui_updates['status'] = text
+    emit_ui_event('status', text)
+
+def set_progress(fraction):
+    fraction = max(0.0, min(1.0, fraction))
+    with ui_updates_lock:
+        ui_updates['progress'] = fraction
+    emit_ui_event('progress', fraction)
+
+def post_ui(action):
+    """Queue a callable to run on the Tk thread at the next UI refresh; safe to call from any thread"""
+    with ui_updates_lock:
+        ui_actions.append(action)
+
+def refresh_ui():
+    """Apply only the latest queued updates, at a fixed rate, however many workers report"""
+    global ui_updates, ui_actions
+    with ui_updates_lock:
+        updates = ui_updates
+        actions = ui_actions
+        ui_updates = {}
+        ui_actions = []
     
-    if download_queue:
-        app.after(0, lambda: status_label.configure(text=f"📦 Batch mode: {len(download_queue)} URLs queued"))
-        app.after(0, lambda: progress_bar.pack(pady=(10, 0)))
-        
-        download_next_in_queue()
+    try:
+        if 'status' in updates:
+            status_label.configure(text=updates['status'])
+        if 'progress' in updates:
+            progress_bar.set(updates['progress'])
+        if updates.get('jobs'):
+            refresh_job_list()
+    except Exception as e:
+        print(f"UI refresh error: {e}")
+    
+    for action in actions:
+        app.after(0, action)
+    
+    app.after(UI_REFRESH_INTERVAL_MS, refresh_ui)
+
+dialog_queue = []
+dialog_open = False
+
+def request_dialog(show_dialog, on_result):
+    """Queue a modal dialog from any thread; dialogs are shown one at a time and on_result gets each return value"""
+    post_ui(lambda: enqueue_dialog(show_dialog, on_result))
+
+def enqueue_dialog(show_dialog, on_result):
+    dialog_queue.append((show_dialog, on_result))
+    show_next_dialog()
 
-def download_next_in_queue():
-    global current_download_index
+def show_next_dialog():
+    global dialog_open
+    if dialog_open or not dialog_queue:
+        return
     
-    if current_download_index < len(download_queue):
-        current_url = download_queue[current_download_index]
-        app.after(0, lambda: status_label.configure(text=f"⬇️ Downloading {current_download_index + 1}/{len(download_queue)}..."))
-        app.after(0, lambda: progress_bar.set((current_download_index + 1) / len(download_queue)))
-        
-        download_thread_obj = threading.Thread(target=batch_download_worker, args=(current_url,))
-        download_thread_obj.daemon = True
-        download_thread_obj.start()
-    else:
-        app.after(0, lambda: status_label.configure(text="✅ Batch download completed!"))
-        app.after(0, lambda: progress_bar.pack_forget())
-        app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {current_format.upper()}", fg_color=("#238636", "#238636")))
-        download_queue.clear()
-        current_download_index = 0
-
-def batch_download_worker(url):
-    global current_download_index
+    show_dialog, on_result = dialog_queue.pop(0)
+    dialog_open = True
     try:
-        ffmpeg_path = get_ffmpeg_path()
-        result = download_single_video(url, ffmpeg_path)
+        value = show_dialog()
+    except Exception as e:
+        print(f"Dialog error: {e}")
+        value = None
+    finally:
+        dialog_open = False
+    
+    on_result(value)
+    if dialog_queue:
+        app.after(0, show_next_dialog)
+
+def wait_for_dialog(show_dialog):
+    """Block a worker thread until its queued dialog is answered and return the answer"""
+    answer = Future()
+    request_dialog(show_dialog, answer.set_result)
+    return answer.result()
+
+def reset_download_controls():
+    progress_bar.pack_forget()
+    button.configure(state="normal", text=f"📥 Download {current_format.upper()}", fg_color=("#238636", "#238636"))
+
+JOB_STATUS_ICONS = {
+    "queued": "⏳",
+    "downloading": "⬇️",
+    "transcoding": "🔄",
+    "done": "✅",
+    "failed": "❌",
+    "cancelled": "⛔",
+    "skipped": "⏭️"
+}
+FINISHED_JOB_STATUSES = ["done", "failed", "cancelled", "skipped"]
+
+job_state_lock = threading.Lock()
+active_jobs = []
+active_jobs_expected = 0
+active_jobs_enumerating = False
+
+class DownloadJob:
+    """State of one URL in a batch or playlist run"""
+    
+    def __init__(self, index, url):
+        self.index = index
+        self.url = url
+        self.status = "queued"
+        self.progress = 0.0
+        self.file_size_mb = 0
+        self.error = None
+        self.run_id = None
+        self.sync_playlist_url = None
+    
+    def set_status(self, status, file_size_mb=0, error=None):
+        with job_state_lock:
+            self.status = status
+            self.file_size_mb = file_size_mb
+            self.error = error
+        if self.run_id:
+            get_job_journal().append({'run': self.run_id, 'job': self.index, 'state': status})
+        emit_ui_event('job', self)
+        schedule_job_list_refresh()
+    
+    def set_progress(self, fraction):
+        with job_state_lock:
+            self.progress = fraction
+        emit_ui_event('job_progress', self)
+        schedule_job_list_refresh()
+    
+    def describe(self):
+        icon = JOB_STATUS_ICONS.get(self.status, "•")
+        if self.status == "done":
+            detail = f" ({self.file_size_mb:.1f} MB)"
+        elif self.status == "failed" and self.error:
+            detail = f" ({self.error[:60]})"
+        elif self.status in ["downloading", "transcoding"]:
+            detail = f" {self.progress:.0%}"
+        else:
+            detail = ""
+        return f"{icon} {self.index + 1}. {self.url}{detail}"
+
+def count_jobs(jobs):
+    with job_state_lock:
+        counts = {status: 0 for status in JOB_STATUS_ICONS}
+        for job in jobs:
+            counts[job.status] += 1
+    return counts
+
+def schedule_job_list_refresh():
+    with ui_updates_lock:
+        ui_updates['jobs'] = True
+
+def refresh_job_list():
+    with job_state_lock:
+        jobs = list(active_jobs)
+        lines = [job.describe() for job in jobs]
+        overall_progress = sum(
+            1.0 if job.status in FINISHED_JOB_STATUSES else job.progress for job in jobs
+        )
+        total = max(len(jobs), active_jobs_expected)
+        total_display = f"{total}+" if active_jobs_enumerating and not active_jobs_expected else str(total)
+    
+    if not jobs:
+        return
+    
+    counts = count_jobs(jobs)
+    finished = sum(counts[status] for status in FINISHED_JOB_STATUSES)
+    if finished < total or active_jobs_enumerating:
+        status_label.configure(text=f"⬇️ {finished}/{total_display} finished: {counts['done']} done, {counts['downloading']} downloading, {counts['transcoding']} converting, {counts['failed']} failed")
+        progress_bar.set(overall_progress / total)
+    
+    job_list_box.configure(state="normal")
+    job_list_box.delete("0.0", "end")
+    job_list_box.insert("0.0", "\n".join(lines))
+    job_list_box.configure(state="disabled")
+
+def show_job_list(jobs, expected_total=0):
+    global active_jobs, active_jobs_expected
+    with job_state_lock:
+        active_jobs = jobs
+        active_jobs_expected = expected_total or 0
+    app.geometry("600x700")
+    job_list_box.pack(pady=(10, 0), fill="x")
+    schedule_job_list_refresh()
+
+def hide_job_list():
+    job_list_box.pack_forget()
+    app.geometry("600x550")
+
+JOURNAL_FLUSH_INTERVAL = 1.0
+JOURNAL_FLUSH_BATCH = 500
+UNFINISHED_JOB_STATES = ["queued", "downloading", "transcoding"]
+
+job_journal = None
+job_journal_lock = threading.Lock()
+
+class JobJournal:
+    """Append-only log of job state transitions; records are buffered and fsynced in batches"""
+    
+    def __init__(self, path):
+        self.path = path
+        self.buffer = []
+        self.buffer_lock = threading.Lock()
+        self.write_lock = threading.Lock()
+        self.flush_event = threading.Event()
+        self.file = open(path, 'a', encoding='utf-8')
         
-        if result == "CANCELLED":
-            app.after(0, lambda: status_label.configure(text="❌ Batch download cancelled"))
+        flusher = threading.Thread(target=self.flush_loop, daemon=True)
+        flusher.start()
+    
+    def append(self, record):
+        record['t'] = round(time.time(), 3)
+        line = json.dumps(record, ensure_ascii=False)
+        with self.buffer_lock:
+            self.buffer.append(line)
+            if len(self.buffer) >= JOURNAL_FLUSH_BATCH:
+                self.flush_event.set()
+    
+    def flush_loop(self):
+        while True:
+            self.flush_event.wait(JOURNAL_FLUSH_INTERVAL)
+            self.flush_event.clear()
+            self.flush()
+    
+    def flush(self):
+        with self.buffer_lock:
+            lines = self.buffer
+            self.buffer = []
+        if not lines:
             return
         
-        current_download_index += 1
-        app.after(0, download_next_in_queue)
+        try:
+            with self.write_lock:
+                self.file.write("\n".join(lines) + "\n")
+                self.file.flush()
+                os.fsync(self.file.fileno())
+        except Exception as e:
+            print(f"Error writing job journal: {e}")
+
+def get_job_journal_path():
+    return os.path.join(get_app_data_dir(), "job_journal.jsonl")
+
+def get_job_journal():
+    global job_journal
+    with job_journal_lock:
+        if job_journal is None:
+            job_journal = JobJournal(get_job_journal_path())
+            atexit.register(job_journal.flush)
+        return job_journal
+
+def load_unfinished_journal_runs():
+    """Replay the journal, return runs with unfinished jobs and compact the file down to them"""
+    journal_path = get_job_journal_path()
+    if job_journal is not None or not os.path.exists(journal_path):
+        return []
+    
+    runs = OrderedDict()
+    try:
+        with open(journal_path, 'r', encoding='utf-8') as f:
+            for line in f:
+                try:
+                    record = json.loads(line)
+                except ValueError:
+                    continue
+                
+                run = runs.setdefault(record['run'], {'info': {}, 'jobs': OrderedDict(), 'finished': False})
+                event = record.get('event')
+                if event == 'run_started':
+                    run['info'] = record
+                elif event == 'run_finished':
+                    run['finished'] = True
+                else:
+                    job = run['jobs'].setdefault(record['job'], {'url': None, 'state': None})
+                    if 'url' in record:
+                        job['url'] = record['url']
+                    job['state'] = record['state']
+        
+        unfinished_runs = []
+        for run_id, run in runs.items():
+            remaining = [(index, job['url']) for index, job in run['jobs'].items()
+                         if job['url'] and job['state'] in UNFINISHED_JOB_STATES]
+            if not run['finished'] and remaining:
+                unfinished_runs.append({'run_id': run_id, 'info': run['info'], 'jobs': remaining})
+        
+        compacted_path = journal_path + ".tmp"
+        with open(compacted_path, 'w', encoding='utf-8') as f:
+            for run in unfinished_runs:
+                f.write(json.dumps(run['info'], ensure_ascii=False) + "\n")
+                for index, url in run['jobs']:
+                    f.write(json.dumps({'run': run['run_id'], 'job': index, 'url': url, 'state': 'queued'}, ensure_ascii=False) + "\n")
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(compacted_path, journal_path)
         
+        return unfinished_runs
     except Exception as e:
-        print(f"Batch download error for {url}: {e}")
-        current_download_index += 1
-        app.after(0, download_next_in_queue)
+        print(f"Error reading job journal: {e}")
+    
+    return []
+
+def offer_to_resume_unfinished_runs(unfinished_runs):
+    global download_queue
+    if not unfinished_runs:
+        return
+    
+    remaining_count = sum(len(run['jobs']) for run in unfinished_runs)
+    response = messagebox.askyesno(
+        "Resume Downloads",
+        f"{remaining_count} downloads from a previous session did not finish.\n\n"
+        f"Do you want to resume them?",
+        icon="question"
+    )
+    
+    journal = get_job_journal()
+    for run in unfinished_runs:
+        journal.append({'run': run['run_id'], 'event': 'run_finished'})
+    
+    if not response or button.cget("state") == "disabled":
+        return
+    
+    download_queue = []
+    resumed_runs = []
+    for run in unfinished_runs:
+        run_jobs = [DownloadJob(len(download_queue) + i, url) for i, (_, url) in enumerate(run['jobs'])]
+        download_queue.extend(run_jobs)
+        resumed_runs.append((run['info'], run_jobs))
+    
+    button.configure(state="disabled", text="📦 Resuming...", fg_color=("#6f42c1", "#6f42c1"))
+    status_label.configure(text=f"📦 Resuming {len(download_queue)} downloads...")
+    progress_bar.pack(pady=(10, 0))
+    progress_bar.set(0)
+    show_job_list(download_queue)
+    run_in_orchestrator(resume_runs_task(resumed_runs))
+
+async def resume_runs_task(resumed_runs):
+    """Finish journaled runs one after another, each in the output format and quality it was started with"""
+    ffmpeg_path = get_ffmpeg_path()
+    completed = True
+    for info, jobs in resumed_runs:
+        output_format = info.get('format') or current_format
+        skip_archived_jobs(jobs, output_format)
+        completed = await run_download_jobs_async(
+            jobs, ffmpeg_path, info.get('video_format'), info.get('audio_format'),
+            kind=info.get('kind') or "batch", source=info.get('source'),
+            output_format=output_format, quality=info.get('quality')
+        )
+        if not completed:
+            break
+    
+    report_batch_result([job for _, jobs in resumed_runs for job in jobs], completed)
+
+download_archive = None
+download_archive_lock = threading.Lock()
+
+def get_download_archive_path():
+    return os.path.join(get_app_data_dir(), "download_archive.txt")
+
+def load_download_archive():
+    """Load the completed video ID/format pairs into a set once per session"""
+    global download_archive
+    with download_archive_lock:
+        if download_archive is None:
+            download_archive = set()
+            try:
+                archive_file = get_download_archive_path()
+                if os.path.exists(archive_file):
+                    with open(archive_file, 'r', encoding='utf-8') as f:
+                        for line in f:
+                            line = line.strip()
+                            if line:
+                                download_archive.add(line)
+            except Exception as e:
+                print(f"Error loading download archive: {e}")
+        return download_archive
+
+def get_archive_key(url, output_format):
+    video_id = extract_video_id(url)
+    return f"{video_id} {output_format}" if video_id else None
+
+def add_to_archive(url, output_format):
+    archive_key = get_archive_key(url, output_format)
+    if not archive_key:
+        return
+    
+    archive = load_download_archive()
+    with download_archive_lock:
+        if archive_key in archive:
+            return
+        archive.add(archive_key)
+        try:
+            with open(get_download_archive_path(), 'a', encoding='utf-8') as f:
+                f.write(archive_key + "\n")
+        except Exception as e:
+            print(f"Error saving download archive: {e}")
+
+def skip_archived_jobs(jobs, output_format=None):
+    """Mark jobs already downloaded in output_format (the current format by default) as skipped; returns how many"""
+    if not skip_archived_downloads:
+        return 0
+    
+    output_format = output_format or current_format
+    archive = load_download_archive()
+    skipped = 0
+    for job in jobs:
+        archive_key = get_archive_key(job.url, output_format)
+        if archive_key and archive_key in archive:
+            job.status = "skipped"
+            skipped += 1
+    return skipped
+
+def set_job_list_enumerating(enumerating):
+    global active_jobs_enumerating, active_jobs_expected
+    with job_state_lock:
+        active_jobs_enumerating = enumerating
+        if not enumerating:
+            active_jobs_expected = 0
+    schedule_job_list_refresh()
+
+BLOCKING_WORKERS = 32
+
+orchestrator_loop = None
+orchestrator_lock = threading.Lock()
+blocking_executor = None
+
+def get_orchestrator_loop():
+    """Start, once, the asyncio loop that schedules all downloads from a single thread"""
+    global orchestrator_loop
+    with orchestrator_lock:
+        if orchestrator_loop is None:
+            orchestrator_loop = asyncio.new_event_loop()
+            threading.Thread(target=orchestrator_loop.run_forever, daemon=True).start()
+        return orchestrator_loop
+
+def run_in_orchestrator(coroutine):
+    return asyncio.run_coroutine_threadsafe(coroutine, get_orchestrator_loop())
+
+def get_blocking_executor():
+    global blocking_executor
+    with orchestrator_lock:
+        if blocking_executor is None:
+            blocking_executor = ThreadPoolExecutor(max_workers=BLOCKING_WORKERS)
+        return blocking_executor
+
+async def run_blocking(function, *args, **kwargs):
+    """Run blocking yt-dlp, ffmpeg or disk work on the shared executor without stalling the loop"""
+    loop = asyncio.get_running_loop()
+    return await loop.run_in_executor(get_blocking_executor(), functools.partial(function, *args, **kwargs))
+
+async def ask_ui(show_dialog):
+    """Queue show_dialog like wait_for_dialog, but await the answer without blocking the loop"""
+    loop = asyncio.get_running_loop()
+    answer = loop.create_future()
+    request_dialog(show_dialog, lambda value: loop.call_soon_threadsafe(answer.set_result, value))
+    return await answer
+
+def run_download_jobs(*args, **kwargs):
+    """Blocking wrapper around run_download_jobs_async for threads outside the orchestrator loop"""
+    return run_in_orchestrator(run_download_jobs_async(*args, **kwargs)).result()
+
+async def run_download_jobs_async(jobs, ffmpeg_path, preset_video_format=None, preset_audio_format=None, kind="batch", source=None, job_source=None,
+                                  output_format=None, quality=None, output_folder=None):
+    """Run jobs with at most max_concurrent_downloads in flight; jobs streamed from job_source are
+    appended to jobs as they arrive. Output settings default to the current ones and are fixed for
+    the whole run. Returns False if the user cancelled"""
+    cancel_event = threading.Event()
+    download_workers = max(1, max_concurrent_downloads)
+    download_slots = asyncio.Semaphore(download_workers)
+    pipeline = TranscodePipeline(download_workers) if pipeline_mode else None
+    
+    output_format = output_format or current_format
+    quality = quality or current_quality
+    output_folder = output_folder or current_download_folder
+    run_id = f"{kind}_{int(time.time() * 1000)}"
+    journal = get_job_journal()
+    journal.append({
+        'run': run_id,
+        'event': 'run_started',
+        'kind': kind,
+        'source': source,
+        'format': output_format,
+        'quality': quality,
+        'video_format': preset_video_format,
+        'audio_format': preset_audio_format
+    })
+    
+    def finish_job(job, file_size):
+        if file_size == "CANCELLED":
+            cancel_event.set()
+            job.set_status("cancelled")
+        elif file_size > 0:
+            add_to_archive(job.url, output_format)
+            job.set_status("done", file_size_mb=file_size)
+        else:
+            job.set_status("failed")
+    
+    def finish_transcode(job, future):
+        try:
+            finish_job(job, future.result())
+        except Exception as transcode_error:
+            print(f"Failed to convert {job.url}: {transcode_error}")
+            job.set_status("failed", error=str(transcode_error))
+    
+    async def run_job(job):
+        async with download_slots:
+            if cancel_event.is_set():
+                job.set_status("cancelled")
+                return
+            
+            job.set_status("downloading")
+            try:
+                file_size = await run_blocking(download_single_video, job.url, ffmpeg_path, preset_video_format, preset_audio_format, pipeline, job.set_progress, kind,
+                                               output_format, quality, output_folder)
+                if isinstance(file_size, Future):
+                    job.set_status("transcoding")
+                    file_size.add_done_callback(lambda future: finish_transcode(job, future))
+                else:
+                    finish_job(job, file_size)
+            except Exception as job_error:
+                print(f"Failed to download {job.url}: {job_error}")
+                job.set_status("failed", error=str(job_error))
+    
+    tasks = []
+    
+    def queue_job(job):
+        job.run_id = run_id
+        journal.append({'run': run_id, 'job': job.index, 'url': job.url, 'state': job.status})
+        if job.status != "skipped":
+            tasks.append(asyncio.create_task(run_job(job)))
+    
+    for job in list(jobs):
+        queue_job(job)
+    
+    if job_source is not None:
+        set_job_list_enumerating(True)
+        try:
+            while not cancel_event.is_set():
+                job = await run_blocking(next, job_source, None)
+                if job is None:
+                    break
+                with job_state_lock:
+                    jobs.append(job)
+                queue_job(job)
+                schedule_job_list_refresh()
+        finally:
+            set_job_list_enumerating(False)
+    
+    await asyncio.gather(*tasks)
+    
+    if pipeline:
+        await run_blocking(pipeline.shutdown)
+    
+    await run_blocking(mark_synced_jobs_seen, list(jobs))
+    
+    journal.append({'run': run_id, 'event': 'run_finished'})
+    return not cancel_event.is_set()
+
+def process_batch_downloads(urls):
+    global download_queue
+    download_queue = [DownloadJob(i, url) for i, url in enumerate(urls)]
+    skipped = skip_archived_jobs(download_queue)
+    
+    if download_queue:
+        status_label.configure(text=f"📦 Batch mode: {len(download_queue) - skipped} URLs queued, {skipped} already downloaded")
+        progress_bar.pack(pady=(10, 0))
+        progress_bar.set(0)
+        show_job_list(download_queue)
+        
+        run_in_orchestrator(batch_download_task(download_queue))
+
+async def batch_download_task(jobs):
+    ffmpeg_path = get_ffmpeg_path()
+    completed = await run_download_jobs_async(jobs, ffmpeg_path)
+    report_batch_result(jobs, completed)
+
+def report_batch_result(jobs, completed):
+    counts = count_jobs(jobs)
+    
+    if completed:
+        set_status(f"✅ Batch download completed! {counts['done']} successful, {counts['failed']} failed, {counts['skipped']} skipped")
+    else:
+        set_status("❌ Batch download cancelled")
+    
+    def finish_batch():
+        refresh_job_list()
+        reset_download_controls()
+    
+    post_ui(finish_batch)
 
 def open_settings():
     settings_menu = tk.CTkToplevel(app)
@@ -340,6 +1003,26 @@ def open_settings():
     playlist_checkbox.grid(row=row_counter, column=0, padx=30, pady=(0, 20), sticky="w")
     row_counter += 1
     
+    playlist_sync_var = tk.BooleanVar(value=playlist_sync_mode)
+    
+    def on_playlist_sync_mode_change():
+        global playlist_sync_mode
+        playlist_sync_mode = playlist_sync_var.get()
+        save_settings_to_file()
+    
+    playlist_sync_checkbox = tk.CTkCheckBox(
+        scrollable_frame,
+        text="🔁 Sync Playlists (only fetch new videos)",
+        variable=playlist_sync_var,
+        command=on_playlist_sync_mode_change,
+        font=tk.CTkFont(size=14),
+        text_color=("#f0f6fc", "#f0f6fc"),
+        fg_color=("#238636", "#238636"),
+        hover_color=("#2ea043", "#2ea043")
+    )
+    playlist_sync_checkbox.grid(row=row_counter, column=0, padx=30, pady=(0, 20), sticky="w")
+    row_counter += 1
+    
     batch_var = tk.BooleanVar(value=batch_mode)
     
     def on_batch_mode_change():
@@ -428,84 +1111,290 @@ def open_settings():
     audio_quality_popup_checkbox.grid(row=row_counter, column=0, padx=30, pady=(0, 20), sticky="w")
     row_counter += 1
     
-    credits_label = tk.CTkLabel(
+    concurrency_label = tk.CTkLabel(
         scrollable_frame,
-        text="ℹ️ Credits:",
+        text="⚡ Simultaneous Downloads:",
         font=tk.CTkFont(size=16, weight="bold"),
         text_color=("#f0f6fc", "#f0f6fc")
     )
-    credits_label.grid(row=row_counter, column=0, padx=30, pady=(10, 5), sticky="w")
+    concurrency_label.grid(row=row_counter, column=0, padx=30, pady=(0, 10), sticky="w")
     row_counter += 1
     
-    credits_text = tk.CTkLabel(
-        scrollable_frame,
-        text="• Made by iWishkem\n• yt-dlp - YouTube video downloader\n• FFmpeg - Media processing toolkit\n• CustomTkinter - Modern UI framework\n",
-        font=tk.CTkFont(size=12),
-        text_color=("#8b949e", "#8b949e"),
-        justify="left"
-    )
-    credits_text.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="w")
+    concurrency_var = tk.StringVar(value=str(max_concurrent_downloads))
     
-    button_frame = tk.CTkFrame(settings_menu, fg_color="transparent")
-    button_frame.grid(row=2, column=0, padx=30, pady=(0, 30), sticky="ew")
-    button_frame.grid_columnconfigure((0, 1), weight=1)
+    def on_concurrency_change(selected_value):
+        global max_concurrent_downloads
+        max_concurrent_downloads = int(selected_value)
+        save_settings_to_file()
     
-    cancel_button = tk.CTkButton(
-        button_frame,
-        text="❌ Cancel",
-        command=settings_menu.destroy,
-        height=45,
-        font=tk.CTkFont(size=14, weight="bold"),
+    concurrency_menu = tk.CTkOptionMenu(
+        scrollable_frame,
+        values=["1", "2", "3", "4", "6", "8"],
+        variable=concurrency_var,
+        command=on_concurrency_change,
+        height=40,
+        font=tk.CTkFont(size=14),
         fg_color=("#21262d", "#21262d"),
-        hover_color=("#30363d", "#30363d"),
-        text_color=("#8b949e", "#8b949e")
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
     )
-    cancel_button.grid(row=0, column=0, padx=(0, 15), sticky="ew")
+    concurrency_menu.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="ew")
+    row_counter += 1
     
-    save_button = tk.CTkButton(
-        button_frame,
-        text="💾 Save Settings",
-        command=lambda: save_settings(
-            current_quality,
-            format_var.get(), 
-            folder_entry.get(), 
-            metadata_var.get(),
-            playlist_var.get(),
-            batch_var.get(),
-            clipboard_var.get(),
-            resolution_popup_var.get(),
-            audio_quality_popup_var.get(),
-            settings_menu
-        ),
-        height=45,
-        font=tk.CTkFont(size=14, weight="bold"),
+    pipeline_var = tk.BooleanVar(value=pipeline_mode)
+    
+    def on_pipeline_mode_change():
+        global pipeline_mode
+        pipeline_mode = pipeline_var.get()
+        save_settings_to_file()
+    
+    pipeline_checkbox = tk.CTkCheckBox(
+        scrollable_frame,
+        text="🔀 Convert while the next videos download",
+        variable=pipeline_var,
+        command=on_pipeline_mode_change,
+        font=tk.CTkFont(size=14),
+        text_color=("#f0f6fc", "#f0f6fc"),
         fg_color=("#238636", "#238636"),
         hover_color=("#2ea043", "#2ea043")
     )
-    save_button.grid(row=0, column=1, padx=(15, 0), sticky="ew")
-
-def browse_folder(entry_widget):
-    folder_path = filedialog.askdirectory(
-        title="Select Download Folder",
-        initialdir=current_download_folder
-    )
-    if folder_path:
-        entry_widget.delete(0, "end")
-        entry_widget.insert(0, folder_path)
-
-def save_settings(quality, format_type, download_folder, metadata, playlist_mode, batch_mode_setting, clipboard_monitoring_setting, resolution_popup_setting, audio_quality_popup_setting, window):
-    global current_quality, current_format, current_download_folder, preserve_metadata, is_playlist_mode
-    global batch_mode, clipboard_monitoring, show_resolution_popup, show_audio_quality_popup
+    pipeline_checkbox.grid(row=row_counter, column=0, padx=30, pady=(0, 20), sticky="w")
+    row_counter += 1
     
-    current_quality = quality
-    current_format = format_type
-    current_download_folder = download_folder
-    preserve_metadata = metadata
-    is_playlist_mode = playlist_mode
-    batch_mode = batch_mode_setting
-    clipboard_monitoring = clipboard_monitoring_setting
-    show_resolution_popup = resolution_popup_setting
-    show_audio_quality_popup = audio_quality_popup_setting
+    skip_archived_var = tk.BooleanVar(value=skip_archived_downloads)
+    
+    def on_skip_archived_change():
+        global skip_archived_downloads
+        skip_archived_downloads = skip_archived_var.get()
+        save_settings_to_file()
+    
+    skip_archived_checkbox = tk.CTkCheckBox(
+        scrollable_frame,
+        text="⏭️ Skip videos already downloaded in this format",
+        variable=skip_archived_var,
+        command=on_skip_archived_change,
+        font=tk.CTkFont(size=14),
+        text_color=("#f0f6fc", "#f0f6fc"),
+        fg_color=("#238636", "#238636"),
+        hover_color=("#2ea043", "#2ea043")
+    )
+    skip_archived_checkbox.grid(row=row_counter, column=0, padx=30, pady=(0, 20), sticky="w")
+    row_counter += 1
+    
+    fragments_label = tk.CTkLabel(
+        scrollable_frame,
+        text="🧩 Parallel Fragments (DASH/HLS):",
+        font=tk.CTkFont(size=16, weight="bold"),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    fragments_label.grid(row=row_counter, column=0, padx=30, pady=(0, 10), sticky="w")
+    row_counter += 1
+    
+    fragments_var = tk.StringVar(value=str(concurrent_fragment_downloads))
+    
+    def on_fragments_change(selected_value):
+        global concurrent_fragment_downloads
+        concurrent_fragment_downloads = int(selected_value)
+        save_settings_to_file()
+    
+    fragments_menu = tk.CTkOptionMenu(
+        scrollable_frame,
+        values=["1", "2", "4", "8", "16"],
+        variable=fragments_var,
+        command=on_fragments_change,
+        height=40,
+        font=tk.CTkFont(size=14),
+        fg_color=("#21262d", "#21262d"),
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
+    )
+    fragments_menu.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="ew")
+    row_counter += 1
+    
+    chunk_size_label = tk.CTkLabel(
+        scrollable_frame,
+        text="📦 HTTP Chunk Size (MB, 0 = off):",
+        font=tk.CTkFont(size=16, weight="bold"),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    chunk_size_label.grid(row=row_counter, column=0, padx=30, pady=(0, 10), sticky="w")
+    row_counter += 1
+    
+    chunk_size_var = tk.StringVar(value=str(http_chunk_size_mb))
+    
+    def on_chunk_size_change(selected_value):
+        global http_chunk_size_mb
+        http_chunk_size_mb = int(selected_value)
+        save_settings_to_file()
+    
+    chunk_size_menu = tk.CTkOptionMenu(
+        scrollable_frame,
+        values=["0", "1", "5", "10", "25", "50"],
+        variable=chunk_size_var,
+        command=on_chunk_size_change,
+        height=40,
+        font=tk.CTkFont(size=14),
+        fg_color=("#21262d", "#21262d"),
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
+    )
+    chunk_size_menu.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="ew")
+    row_counter += 1
+    
+    buffer_size_label = tk.CTkLabel(
+        scrollable_frame,
+        text="🗃️ Download Buffer (KB):",
+        font=tk.CTkFont(size=16, weight="bold"),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    buffer_size_label.grid(row=row_counter, column=0, padx=30, pady=(0, 10), sticky="w")
+    row_counter += 1
+    
+    buffer_size_var = tk.StringVar(value=str(buffer_size_kb))
+    
+    def on_buffer_size_change(selected_value):
+        global buffer_size_kb
+        buffer_size_kb = int(selected_value)
+        save_settings_to_file()
+    
+    buffer_size_menu = tk.CTkOptionMenu(
+        scrollable_frame,
+        values=["16", "64", "256", "1024"],
+        variable=buffer_size_var,
+        command=on_buffer_size_change,
+        height=40,
+        font=tk.CTkFont(size=14),
+        fg_color=("#21262d", "#21262d"),
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
+    )
+    buffer_size_menu.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="ew")
+    row_counter += 1
+    
+    bandwidth_label = tk.CTkLabel(
+        scrollable_frame,
+        text="🚦 Bandwidth Limit (MB/s, 0 = unlimited):",
+        font=tk.CTkFont(size=16, weight="bold"),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    bandwidth_label.grid(row=row_counter, column=0, padx=30, pady=(0, 10), sticky="w")
+    row_counter += 1
+    
+    bandwidth_var = tk.StringVar(value=str(bandwidth_limit_mb))
+    
+    def on_bandwidth_change(selected_value):
+        global bandwidth_limit_mb
+        bandwidth_limit_mb = int(selected_value)
+        bandwidth_limiter.set_limit(bandwidth_limit_mb * 1024 * 1024)
+        save_settings_to_file()
+    
+    bandwidth_menu = tk.CTkOptionMenu(
+        scrollable_frame,
+        values=["0", "1", "2", "5", "10", "25", "50", "100"],
+        variable=bandwidth_var,
+        command=on_bandwidth_change,
+        height=40,
+        font=tk.CTkFont(size=14),
+        fg_color=("#21262d", "#21262d"),
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
+    )
+    bandwidth_menu.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="ew")
+    row_counter += 1
+    
+    credits_label = tk.CTkLabel(
+        scrollable_frame,
+        text="ℹ️ Credits:",
+        font=tk.CTkFont(size=16, weight="bold"),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    credits_label.grid(row=row_counter, column=0, padx=30, pady=(10, 5), sticky="w")
+    row_counter += 1
+    
+    credits_text = tk.CTkLabel(
+        scrollable_frame,
+        text="• Made by iWishkem\n• yt-dlp - YouTube video downloader\n• FFmpeg - Media processing toolkit\n• CustomTkinter - Modern UI framework\n",
+        font=tk.CTkFont(size=12),
+        text_color=("#8b949e", "#8b949e"),
+        justify="left"
+    )
+    credits_text.grid(row=row_counter, column=0, padx=30, pady=(0, 25), sticky="w")
+    
+    button_frame = tk.CTkFrame(settings_menu, fg_color="transparent")
+    button_frame.grid(row=2, column=0, padx=30, pady=(0, 30), sticky="ew")
+    button_frame.grid_columnconfigure((0, 1), weight=1)
+    
+    cancel_button = tk.CTkButton(
+        button_frame,
+        text="❌ Cancel",
+        command=settings_menu.destroy,
+        height=45,
+        font=tk.CTkFont(size=14, weight="bold"),
+        fg_color=("#21262d", "#21262d"),
+        hover_color=("#30363d", "#30363d"),
+        text_color=("#8b949e", "#8b949e")
+    )
+    cancel_button.grid(row=0, column=0, padx=(0, 15), sticky="ew")
+    
+    save_button = tk.CTkButton(
+        button_frame,
+        text="💾 Save Settings",
+        command=lambda: save_settings(
+            current_quality,
+            format_var.get(), 
+            folder_entry.get(), 
+            metadata_var.get(),
+            playlist_var.get(),
+            batch_var.get(),
+            clipboard_var.get(),
+            resolution_popup_var.get(),
+            audio_quality_popup_var.get(),
+            int(concurrency_var.get()),
+            pipeline_var.get(),
+            int(fragments_var.get()),
+            int(chunk_size_var.get()),
+            int(buffer_size_var.get()),
+            skip_archived_var.get(),
+            playlist_sync_var.get(),
+            settings_menu
+        ),
+        height=45,
+        font=tk.CTkFont(size=14, weight="bold"),
+        fg_color=("#238636", "#238636"),
+        hover_color=("#2ea043", "#2ea043")
+    )
+    save_button.grid(row=0, column=1, padx=(15, 0), sticky="ew")
+
+def browse_folder(entry_widget):
+    folder_path = filedialog.askdirectory(
+        title="Select Download Folder",
+        initialdir=current_download_folder
+    )
+    if folder_path:
+        entry_widget.delete(0, "end")
+        entry_widget.insert(0, folder_path)
+
+def save_settings(quality, format_type, download_folder, metadata, playlist_mode, batch_mode_setting, clipboard_monitoring_setting, resolution_popup_setting, audio_quality_popup_setting, concurrency_setting, pipeline_mode_setting, fragments_setting, chunk_size_setting, buffer_size_setting, skip_archived_setting, playlist_sync_setting, window):
+    global current_quality, current_format, current_download_folder, preserve_metadata, is_playlist_mode
+    global batch_mode, clipboard_monitoring, show_resolution_popup, show_audio_quality_popup, max_concurrent_downloads
+    global pipeline_mode, concurrent_fragment_downloads, http_chunk_size_mb, buffer_size_kb, skip_archived_downloads, playlist_sync_mode
+    
+    current_quality = quality
+    current_format = format_type
+    current_download_folder = download_folder
+    preserve_metadata = metadata
+    is_playlist_mode = playlist_mode
+    batch_mode = batch_mode_setting
+    clipboard_monitoring = clipboard_monitoring_setting
+    show_resolution_popup = resolution_popup_setting
+    show_audio_quality_popup = audio_quality_popup_setting
+    max_concurrent_downloads = concurrency_setting
+    pipeline_mode = pipeline_mode_setting
+    concurrent_fragment_downloads = fragments_setting
+    http_chunk_size_mb = chunk_size_setting
+    buffer_size_kb = buffer_size_setting
+    skip_archived_downloads = skip_archived_setting
+    playlist_sync_mode = playlist_sync_setting
     
     save_settings_to_file()
     
@@ -521,38 +1410,131 @@ def save_settings(quality, format_type, download_folder, metadata, playlist_mode
     
     window.destroy()
 
-def add_to_history(title, format_type, file_path):
-    global download_history
-    download_history.insert(0, {
-        'title': title,
-        'format': format_type,
-        'path': file_path,
-        'timestamp': datetime.now().strftime("%Y-%m-%d %H:%M:%S")
-    })
-    if len(download_history) > 10:
-        download_history = download_history[:10]
-    save_download_history()
+HISTORY_PAGE_SIZE = 50
+
+history_db = None
+history_lock = threading.Lock()
+
+def get_history_db():
+    global history_db
+    if history_db is None:
+        db_path = os.path.join(get_app_data_dir(), "download_history.db")
+        history_db = sqlite3.connect(db_path, check_same_thread=False)
+        history_db.execute("PRAGMA journal_mode=WAL")
+        history_db.execute("PRAGMA synchronous=NORMAL")
+        history_db.execute(
+            "CREATE TABLE IF NOT EXISTS history ("
+            "id INTEGER PRIMARY KEY AUTOINCREMENT, title TEXT, format TEXT, path TEXT, timestamp TEXT)"
+        )
+        history_db.execute("CREATE INDEX IF NOT EXISTS history_by_format ON history (format, id)")
+        history_db.execute("CREATE INDEX IF NOT EXISTS history_by_time ON history (timestamp)")
+        history_db.execute("CREATE TABLE IF NOT EXISTS history_meta (key TEXT PRIMARY KEY, value TEXT)")
+        migrate_json_history(history_db)
+        history_db.commit()
+    return history_db
 
-def save_download_history():
+def migrate_json_history(db):
+    """Move entries from the old capped download_history.json into the history database"""
+    history_file = os.path.join(get_app_data_dir(), "download_history.json")
+    if not os.path.exists(history_file):
+        return
+    
     try:
-        app_data_dir = get_app_data_dir()
-        history_file = os.path.join(app_data_dir, "download_history.json")
-        with open(history_file, 'w') as f:
-            json.dump(download_history, f)
+        # The migration is recorded in the same transaction as the entries, so a crash before the
+        # JSON file is renamed cannot import it twice
+        if not db.execute("SELECT 1 FROM history_meta WHERE key = 'json_migrated'").fetchone():
+            with open(history_file, 'r') as f:
+                old_history = json.load(f)
+            # The JSON list is newest first, insert oldest first so ids follow download order
+            db.executemany(
+                "INSERT INTO history (title, format, path, timestamp) VALUES (?, ?, ?, ?)",
+                [(item.get('title', ''), item.get('format', ''), item.get('path', ''), item.get('timestamp', ''))
+                 for item in reversed(old_history)]
+            )
+            db.execute(
+                "INSERT INTO history_meta (key, value) VALUES ('json_migrated', ?)",
+                (datetime.now().strftime("%Y-%m-%d %H:%M:%S"),)
+            )
+            db.commit()
+            print(f"Migrated {len(old_history)} history entries")
+        os.replace(history_file, history_file + ".migrated")
+    except Exception as e:
+        db.rollback()
+        print(f"Error migrating history: {e}")
+
+def add_to_history(title, format_type, file_path):
+    try:
+        with history_lock:
+            db = get_history_db()
+            db.execute(
+                "INSERT INTO history (title, format, path, timestamp) VALUES (?, ?, ?, ?)",
+                (title, format_type, file_path, datetime.now().strftime("%Y-%m-%d %H:%M:%S"))
+            )
+            db.commit()
     except Exception as e:
         print(f"Error saving history: {e}")
 
 def load_download_history():
-    global download_history
     try:
-        app_data_dir = get_app_data_dir()
-        history_file = os.path.join(app_data_dir, "download_history.json")
-        if os.path.exists(history_file):
-            with open(history_file, 'r') as f:
-                download_history = json.load(f)
+        with history_lock:
+            get_history_db()
     except Exception as e:
         print(f"Error loading history: {e}")
 
+def get_history_filter(search_text="", format_filter=None, date_prefix=""):
+    conditions = []
+    params = []
+    if search_text:
+        conditions.append("title LIKE ? ESCAPE '\\'")
+        escaped = search_text.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+        params.append(f"%{escaped}%")
+    if format_filter:
+        conditions.append("format = ?")
+        params.append(format_filter)
+    if date_prefix:
+        # Timestamps are "YYYY-MM-DD HH:MM:SS", so a date prefix is an index range
+        conditions.append("timestamp >= ? AND timestamp < ?")
+        params.extend([date_prefix, date_prefix + "~"])
+    return conditions, params
+
+def search_download_history(search_text="", format_filter=None, date_prefix="", before_id=None, limit=HISTORY_PAGE_SIZE):
+    """Newest-first page of history entries matching the filters; pass the last id seen to get the next page"""
+    conditions, params = get_history_filter(search_text, format_filter, date_prefix)
+    if before_id is not None:
+        conditions.append("id < ?")
+        params.append(before_id)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    
+    try:
+        with history_lock:
+            rows = get_history_db().execute(
+                f"SELECT id, title, format, path, timestamp FROM history {where} ORDER BY id DESC LIMIT ?",
+                params + [limit]
+            ).fetchall()
+    except Exception as e:
+        print(f"Error searching history: {e}")
+        return []
+    
+    return [{'id': row[0], 'title': row[1], 'format': row[2], 'path': row[3], 'timestamp': row[4]} for row in rows]
+
+def count_download_history(search_text="", format_filter=None, date_prefix=""):
+    conditions, params = get_history_filter(search_text, format_filter, date_prefix)
+    where = f"WHERE {' AND '.join(conditions)}" if conditions else ""
+    try:
+        with history_lock:
+            return get_history_db().execute(f"SELECT COUNT(*) FROM history {where}", params).fetchone()[0]
+    except Exception as e:
+        print(f"Error counting history: {e}")
+        return 0
+
+def get_history_formats():
+    try:
+        with history_lock:
+            return [row[0] for row in get_history_db().execute("SELECT DISTINCT format FROM history ORDER BY format")]
+    except Exception as e:
+        print(f"Error reading history formats: {e}")
+        return []
+
 def cleanup_old_data_files():
     try:
         old_stats_file = os.path.join(current_download_folder, "download_stats.json")
@@ -569,11 +1551,6 @@ def cleanup_old_data_files():
     except Exception as e:
         print(f"Error cleaning up old files: {e}")
 
-def animate_progress_bar():
-    for i in range(101):
-        progress_bar.set(i / 100)
-        time.sleep(0.01)
-
 def pulse_button():
     if button.cget("state") == "normal":
         original_color = button.cget("fg_color")
@@ -588,83 +1565,120 @@ def clear_placeholder(event):
         textbox.configure(border_color=("#58a6ff", "#58a6ff"))
         return "break"
 
-def download_as_audio_fallback(url, ffmpeg_path, temp_dir):
+AUDIO_FALLBACK_MAX_ATTEMPTS = 3
+DOWNLOAD_ERROR_PATTERNS = [
+    ('geo_blocked', ["not available in your country", "geo-restricted", "geo restricted", "geo-blocked", "blocked it in your country"]),
+    ('age_restricted', ["age-restricted", "age restricted", "confirm your age", "inappropriate for some users"]),
+    ('private', ["private video", "video is private", "members-only", "members only", "join this channel"]),
+    ('unavailable', ["video unavailable", "has been removed", "been terminated", "no longer available", "does not exist", "deleted"]),
+    ('format_unavailable', ["requested format is not available", "format not available", "no video formats"]),
+    ('network', ["timed out", "connection", "network", "temporary failure", "http error 5"])
+]
+# No other format can get past these, so the fallback gives up instead of trying them all
+UNRECOVERABLE_DOWNLOAD_ERRORS = {
+    'geo_blocked': "Content blocked in your region",
+    'age_restricted': "Age-restricted video requires sign-in",
+    'private': "Video is private",
+    'unavailable': "Video unavailable or deleted"
+}
+
+def classify_download_error(error):
+    error_msg = str(error).lower()
+    for error_kind, patterns in DOWNLOAD_ERROR_PATTERNS:
+        if any(pattern in error_msg for pattern in patterns):
+            return error_kind
+    return 'unknown'
+
+def rank_audio_fallback_formats(info, limit=AUDIO_FALLBACK_MAX_ATTEMPTS):
+    """Pick up to limit formats of one extraction, most suitable for an audio-only download first"""
+    audio_only = []
+    with_video = []
+    for fmt in info.get('formats') or []:
+        if not fmt.get('format_id') or fmt.get('acodec') == 'none':
+            continue
+        if fmt.get('vcodec') == 'none':
+            audio_only.append(fmt)
+        else:
+            with_video.append(fmt)
+    
+    audio_only.sort(key=lambda fmt: (fmt.get('abr') or fmt.get('tbr') or 0, fmt.get('ext') in ['m4a', 'mp3']), reverse=True)
+    # Muxed formats are only a last resort, the smallest ones waste the least bandwidth on video
+    with_video.sort(key=lambda fmt: (fmt.get('acodec') is None, fmt.get('tbr') or float('inf')))
+    # Keep one muxed format in the set: when every adaptive (DASH) URL is refused, it is the one that still works
+    audio_only = audio_only[:limit - 1] if with_video else audio_only[:limit]
+    return [fmt['format_id'] for fmt in audio_only + with_video[:limit - len(audio_only)]]
+
+def download_as_audio_fallback(url, ffmpeg_path, temp_dir, progress_callback=None, cause=None, priority="single", quality=None, output_folder=None):
+    quality = quality or current_quality
+    output_folder = output_folder or current_download_folder
     try:
-        app.after(0, lambda: status_label.configure(text="🎵 Attempting audio-only download..."))
+        cause_kind = classify_download_error(cause) if cause is not None else None
+        if cause_kind in UNRECOVERABLE_DOWNLOAD_ERRORS:
+            raise Exception(UNRECOVERABLE_DOWNLOAD_ERRORS[cause_kind])
         
-        safe_title = f"audio_{int(time.time())}"
-        uploader = 'Unknown'
-        duration = 0
+        set_status("🎵 Attempting audio-only download...")
         
-        strategies = [
-            {
-                'name': 'Audio-only with cookies',
-                'opts': {
-                    'format': 'bestaudio/best',
-                    'outtmpl': os.path.join(temp_dir, f"{safe_title}_1.%(ext)s"),
-                    'quiet': True,
-                    'no_warnings': True,
-                    'ignoreerrors': True,
-                    'extract_flat': False,
-                }
-            },
-            {
-                'name': 'Best available format',
-                'opts': {
-                    'format': 'best/worst',
-                    'outtmpl': os.path.join(temp_dir, f"{safe_title}_2.%(ext)s"),
-                    'quiet': True,
-                    'no_warnings': True,
-                    'ignoreerrors': True,
-                    'extract_flat': False,
-                }
-            },
-            {
-                'name': 'Any audio format',
-                'opts': {
-                    'format': 'bestaudio[ext=m4a]/bestaudio[ext=mp3]/bestaudio',
-                    'outtmpl': os.path.join(temp_dir, f"{safe_title}_3.%(ext)s"),
-                    'quiet': True,
-                    'no_warnings': True,
-                    'ignoreerrors': True,
-                    'extract_flat': False,
-                }
-            }
-        ]
+        info = get_cached_info(url)
+        if info is None:
+            try:
+                info = extract_video_info(url)
+            except Exception as extract_error:
+                error_kind = classify_download_error(extract_error)
+                raise Exception(UNRECOVERABLE_DOWNLOAD_ERRORS.get(error_kind, f"Content not accessible: {extract_error}"))
+        if not info:
+            raise Exception("Content not accessible")
+        
+        video_title = info.get('title') or f"audio_{int(time.time())}"
+        safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip() or f"audio_{int(time.time())}"
+        uploader = info.get('uploader', 'Unknown')
+        duration = info.get('duration', 0)
+        progress_hooks = [make_bandwidth_hook(priority)]
+        if progress_callback:
+            progress_hooks.append(make_progress_hook(progress_callback))
+        
+        candidates = rank_audio_fallback_formats(info)
+        if not candidates:
+            raise Exception("No audio formats available")
         
         downloaded_file = None
+        last_error = None
         
-        for i, strategy in enumerate(strategies):
+        for i, format_id in enumerate(candidates):
             try:
-                app.after(0, lambda: status_label.configure(text=f"🔄 Trying strategy {i+1}/3..."))
-                print(f"Trying {strategy['name']}")
+                set_status(f"🔄 Trying strategy {i+1}/{len(candidates)}...")
+                print(f"Trying audio fallback format {format_id}")
                 
-                with yt_dlp.YoutubeDL(strategy['opts']) as ydl:
-                    ydl.download([url])
+                ydl_opts = {
+                    'format': format_id,
+                    'outtmpl': os.path.join(temp_dir, f"{safe_title}_{i + 1}.%(ext)s"),
+                    'quiet': True,
+                    'no_warnings': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+                with pooled_ydl(ydl_opts) as ydl:
+                    ydl.process_ie_result(copy.deepcopy(info), download=True)
                 
-                temp_files = [f for f in os.listdir(temp_dir) 
-                             if not f.endswith('.part') and not f.endswith('.tmp')]
+                temp_files = list_finished_work_files(temp_dir, safe_title)
                 
                 if temp_files:
                     downloaded_file = os.path.join(temp_dir, temp_files[0])
-                    print(f"Success with {strategy['name']}: {downloaded_file}")
+                    print(f"Success with format {format_id}: {downloaded_file}")
                     break
                     
             except Exception as strategy_error:
                 print(f"Strategy {i+1} failed: {strategy_error}")
-                continue
+                last_error = strategy_error
+                if classify_download_error(strategy_error) in UNRECOVERABLE_DOWNLOAD_ERRORS:
+                    break
         
         if not downloaded_file or not os.path.exists(downloaded_file):
-            try:
-                with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    if info:
-                        app.after(0, lambda: status_label.configure(text="❌ Content found but download blocked"))
-                    else:
-                        app.after(0, lambda: status_label.configure(text="❌ Content not accessible"))
-            except:
-                app.after(0, lambda: status_label.configure(text="❌ Video completely unavailable"))
-            
+            error_kind = classify_download_error(last_error) if last_error else 'unknown'
+            if error_kind in UNRECOVERABLE_DOWNLOAD_ERRORS:
+                raise Exception(UNRECOVERABLE_DOWNLOAD_ERRORS[error_kind])
+            set_status("❌ Content found but download blocked")
+            if last_error:
+                raise Exception(f"All download strategies failed - {last_error}")
             raise Exception("All download strategies failed - content may be geo-blocked, deleted, or private")
         
         file_size = os.path.getsize(downloaded_file)
@@ -675,27 +1689,23 @@ def download_as_audio_fallback(url, ffmpeg_path, temp_dir):
             file_ext = '.mp3'
         
         final_filename = f"{safe_title}{file_ext}"
-        final_path = os.path.join(current_download_folder, final_filename)
+        final_path = os.path.join(output_folder, final_filename)
         
         counter = 1
         while os.path.exists(final_path):
             name_part = f"{safe_title}_{counter}"
             final_filename = f"{name_part}{file_ext}"
-            final_path = os.path.join(current_download_folder, final_filename)
+            final_path = os.path.join(output_folder, final_filename)
             counter += 1
         
         if file_ext.lower() != '.mp3' and ffmpeg_path and os.path.exists(ffmpeg_path):
             try:
-                app.after(0, lambda: status_label.configure(text="🔄 Converting to MP3..."))
+                set_status("🔄 Converting to MP3...")
                 mp3_path = final_path.replace(file_ext, '.mp3')
                 
                 cmd = [ffmpeg_path, '-i', downloaded_file, '-acodec', 'libmp3lame', 
-                       '-ab', f'{current_quality}k', mp3_path]
-                startupinfo = hide_console_window()
-                if startupinfo:
-                    subprocess.run(cmd, check=True, capture_output=True, startupinfo=startupinfo)
-                else:
-                    subprocess.run(cmd, check=True, capture_output=True)
+                       '-ab', f'{quality}k', mp3_path]
+                run_ffmpeg(cmd)
                 
                 final_path = mp3_path
                 final_filename = os.path.basename(mp3_path)
@@ -704,7 +1714,7 @@ def download_as_audio_fallback(url, ffmpeg_path, temp_dir):
         else:
             shutil.move(downloaded_file, final_path)
         
-        app.after(0, lambda: status_label.configure(text="✅ Audio download completed!"))
+        set_status("✅ Audio download completed!")
         
         format_name = file_ext.upper().replace('.', '') + " (Audio Fallback)"
         add_to_history(safe_title, format_name, final_path)
@@ -713,11 +1723,63 @@ def download_as_audio_fallback(url, ffmpeg_path, temp_dir):
         
     except Exception as e:
         error_msg = f"❌ Audio fallback failed: {str(e)}"
-        app.after(0, lambda: status_label.configure(text=error_msg))
+        set_status(error_msg)
         print(f"Audio fallback error: {e}")
-        return 0
+        # Raised rather than returned as 0 so the job records why it failed
+        raise
 
-def download_thread(url):
+def get_playlist_entry_url(entry):
+    if not entry:
+        return None
+    
+    if 'url' in entry:
+        return entry['url']
+    elif 'id' in entry:
+        entry_id = entry['id']
+        if (len(entry_id) == 11 and 
+            entry_id.replace('-', '').replace('_', '').isalnum() and
+            not entry_id.startswith(('PL', 'UC', 'UU'))):
+            return f"https://www.youtube.com/watch?v={entry_id}"
+    
+    return None
+
+def generate_playlist_jobs(entries, sync_playlist_url=None, output_format=None):
+    job_index = 0
+    for entry in entries:
+        video_url = get_playlist_entry_url(entry)
+        if not video_url:
+            print(f"Skipping entry with no valid URL/ID: {entry}")
+            continue
+        job = DownloadJob(job_index, video_url)
+        job.sync_playlist_url = sync_playlist_url
+        skip_archived_jobs([job], output_format)
+        job_index += 1
+        yield job
+
+def generate_url_jobs(urls, output_format=None, playlist_mode=None):
+    """Expand playlist URLs lazily (when playlist mode is on) and chain everything into one job stream"""
+    if playlist_mode is None:
+        playlist_mode = is_playlist_mode
+    job_index = 0
+    for url in urls:
+        if playlist_mode and is_playlist_url(url):
+            playlist_info = get_playlist_updates(url) if playlist_sync_mode else get_playlist_stream(url)
+            if playlist_info:
+                if playlist_info['count']:
+                    set_status(f"📋 {playlist_info['title']}: {playlist_info['count']} videos")
+                for job in generate_playlist_jobs(playlist_info['entries'], url if playlist_sync_mode else None, output_format):
+                    job.index = job_index
+                    job_index += 1
+                    yield job
+                continue
+            set_status("⚠️ Playlist info failed, downloading single video...")
+        
+        job = DownloadJob(job_index, url)
+        skip_archived_jobs([job], output_format)
+        job_index += 1
+        yield job
+
+async def download_task(url):
    
     start_time = time.time()
     total_size_mb = 0
@@ -726,166 +1788,121 @@ def download_thread(url):
         ffmpeg_path = get_ffmpeg_path()
         
         if is_playlist_mode and is_playlist_url(url):
-            playlist_info = get_playlist_info(url)
+            playlist_info = await run_blocking(get_playlist_updates if playlist_sync_mode else get_playlist_stream, url)
+            if playlist_info and playlist_sync_mode and not playlist_info['entries']:
+                set_status("✅ Playlist is up to date, no new videos")
+                post_ui(reset_download_controls)
+                return
+            
             if playlist_info:
                 playlist_count = playlist_info['count']
-                app.after(0, lambda: status_label.configure(text=f"📋 Found playlist: {playlist_count} videos"))
+                if playlist_sync_mode:
+                    set_status(f"🔁 Playlist sync: {playlist_count} new videos")
+                elif playlist_count:
+                    set_status(f"📋 Found playlist: {playlist_count} videos")
+                else:
+                    set_status("📋 Found playlist, loading videos...")
                 
-                if playlist_count > 100:
-                    import tkinter.messagebox as msgbox
-                    response = msgbox.askyesno(
+                if playlist_count and playlist_count > 100:
+                    response = await ask_ui(lambda: messagebox.askyesno(
                         "Large Playlist Detected", 
                         f"This playlist contains {playlist_count} videos. This may take a very long time to download.\n\n"
                         f"Do you want to continue?",
                         icon="warning"
-                    )
+                    ))
                     if not response:
-                        app.after(0, lambda: status_label.configure(text="❌ Playlist download cancelled by user"))
-                        format_display = current_format.upper()
-                        app.after(0, lambda: progress_bar.pack_forget())
-                        app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+                        set_status("❌ Playlist download cancelled by user")
+                        post_ui(reset_download_controls)
                         return
                 
                 playlist_video_format = None
                 playlist_audio_format = None
                 
-                first_video_url = None
-                for entry in playlist_info['entries']:
-                    if entry:
-                        if 'url' in entry:
-                            first_video_url = entry['url']
-                            break
-                        elif 'id' in entry:
-                            entry_id = entry['id']
-                            if (len(entry_id) == 11 and 
-                                entry_id.replace('-', '').replace('_', '').isalnum() and
-                                not entry_id.startswith(('PL', 'UC', 'UU'))):
-                                first_video_url = f"https://www.youtube.com/watch?v={entry_id}"
-                                break
+                playlist_job_source = generate_playlist_jobs(playlist_info['entries'], url if playlist_sync_mode else None)
+                playlist_jobs = []
+                while True:
+                    job = await run_blocking(next, playlist_job_source, None)
+                    if job is None:
+                        break
+                    playlist_jobs.append(job)
+                    if job.status != "skipped":
+                        break
+                
+                pending_jobs = [job for job in playlist_jobs if job.status != "skipped"]
+                first_video_url = pending_jobs[0].url if pending_jobs else None
                 
                 if first_video_url:
                     if current_format in ["mkv", "mp4"] and show_resolution_popup:
-                        app.after(0, lambda: status_label.configure(text="🔍 Getting available resolutions for playlist..."))
-                        available_formats = get_available_video_formats(first_video_url)
+                        set_status("🔍 Getting available resolutions for playlist...")
+                        available_formats = await run_blocking(get_available_video_formats, first_video_url)
                         
                         if available_formats:
-                            result_container = {"format_id": None, "completed": False}
-                            
-                            def show_popup():
-                                result_container["format_id"] = show_resolution_selection_popup(first_video_url, available_formats)
-                                result_container["completed"] = True
-                            
-                            app.after(0, show_popup)
-                            
-                            while not result_container["completed"]:
-                                time.sleep(0.1)
-                            
-                            playlist_video_format = result_container["format_id"]
+                            playlist_video_format = await ask_ui(lambda: show_resolution_selection_popup(first_video_url, available_formats))
                             
                             if not playlist_video_format:
-                                app.after(0, lambda: status_label.configure(text="❌ Playlist download cancelled"))
-                                format_display = current_format.upper()
-                                app.after(0, lambda: progress_bar.pack_forget())
-                                app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+                                set_status("❌ Playlist download cancelled")
+                                post_ui(reset_download_controls)
                                 return
+                            
+                            # Format IDs differ between videos, so every entry resolves the choice against its own formats
+                            playlist_video_format = make_video_format_policy(playlist_video_format, available_formats)
                     
                     elif current_format in ["mp3", "wav", "flac", "m4a"] and show_audio_quality_popup:
-                        app.after(0, lambda: status_label.configure(text="🔍 Getting available audio qualities for playlist..."))
-                        available_formats = get_available_audio_formats(first_video_url)
-                        
-                        result_container = {"format": None, "completed": False}
-                        
-                        def show_popup():
-                            result_container["format"] = show_audio_quality_selection_popup(first_video_url, available_formats)
-                            result_container["completed"] = True
-                        
-                        app.after(0, show_popup)
-                        
-                        while not result_container["completed"]:
-                            time.sleep(0.1)
-                        
-                        playlist_audio_format = result_container["format"]
+                        set_status("🔍 Getting available audio qualities for playlist...")
+                        available_formats = await run_blocking(get_available_audio_formats, first_video_url)
+                        playlist_audio_format = await ask_ui(lambda: show_audio_quality_selection_popup(first_video_url, available_formats))
                         
                         if not playlist_audio_format:
-                            app.after(0, lambda: status_label.configure(text="❌ Playlist download cancelled"))
-                            format_display = current_format.upper()
-                            app.after(0, lambda: progress_bar.pack_forget())
-                            app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+                            set_status("❌ Playlist download cancelled")
+                            post_ui(reset_download_controls)
                             return
                 
-                app.after(0, lambda: progress_bar.pack(pady=(10, 0)))
-                successful_downloads = 0
-                failed_downloads = 0
+                post_ui(lambda: progress_bar.pack(pady=(10, 0)))
                 
-                for i, entry in enumerate(playlist_info['entries']):
-                    if entry:
-                        try:
-                            if 'url' in entry:
-                                video_url = entry['url']
-                            elif 'id' in entry:
-                                entry_id = entry['id']
-                                if (len(entry_id) == 11 and 
-                                    entry_id.replace('-', '').replace('_', '').isalnum() and
-                                    not entry_id.startswith(('PL', 'UC', 'UU'))):
-                                    video_url = f"https://www.youtube.com/watch?v={entry_id}"
-                                else:
-                                    print(f"Skipping invalid video ID in playlist: {entry_id}")
-                                    continue
-                            else:
-                                print(f"Skipping entry with no valid URL/ID: {entry}")
-                                continue
-                            
-                            app.after(0, lambda i=i, total=playlist_count: status_label.configure(text=f"⬇️ Downloading {i+1}/{total}: {successful_downloads} done, {failed_downloads} failed"))
-                            app.after(0, lambda i=i, total=playlist_count: progress_bar.set((i+1) / total))
-                            
-                            file_size = download_single_video(video_url, ffmpeg_path, playlist_video_format, playlist_audio_format)
-                            if file_size == "CANCELLED":
-                                app.after(0, lambda: status_label.configure(text="❌ Playlist download cancelled"))
-                                return
-                            elif file_size > 0:
-                                successful_downloads += 1
-                                total_size_mb += file_size
-                            else:
-                                failed_downloads += 1
-                        except Exception as video_error:
-                            print(f"Failed to download video {i+1}: {video_error}")
-                            failed_downloads += 1
-                            app.after(0, lambda i=i, failed=failed_downloads: status_label.configure(text=f"⚠️ Skipped video {i+1} (error) - {failed} failed so far"))
-                            continue
+                post_ui(lambda: show_job_list(playlist_jobs, playlist_count))
                 
-                app.after(0, lambda: status_label.configure(text=f"✅ Playlist completed! {successful_downloads} successful, {failed_downloads} failed"))
+                completed = await run_download_jobs_async(playlist_jobs, ffmpeg_path, playlist_video_format, playlist_audio_format, kind="playlist", source=url, job_source=playlist_job_source)
+                if not completed:
+                    set_status("❌ Playlist download cancelled")
+                    post_ui(reset_download_controls)
+                    return
+                
+                counts = count_jobs(playlist_jobs)
+                successful_downloads = counts["done"]
+                failed_downloads = counts["failed"]
+                skipped_downloads = counts["skipped"]
+                for job in playlist_jobs:
+                    total_size_mb += job.file_size_mb
+                    print(job.describe())
+                
+                post_ui(refresh_job_list)
+                set_status(f"✅ Playlist completed! {successful_downloads} successful, {failed_downloads} failed, {skipped_downloads} skipped")
             else:
-                app.after(0, lambda: status_label.configure(text="⚠️ Playlist info failed, downloading single video..."))
-                file_size = download_single_video(url, ffmpeg_path)
+                set_status("⚠️ Playlist info failed, downloading single video...")
+                file_size = await run_blocking(download_single_video, url, ffmpeg_path, progress_callback=set_progress)
                 if file_size == "CANCELLED":
-                    format_display = current_format.upper()
-                    app.after(0, lambda: progress_bar.pack_forget())
-                    app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+                    post_ui(reset_download_controls)
                     return
                 total_size_mb += file_size
         else:
-            file_size = download_single_video(url, ffmpeg_path)
+            file_size = await run_blocking(download_single_video, url, ffmpeg_path, progress_callback=set_progress)
             if file_size == "CANCELLED":
-                format_display = current_format.upper()
-                app.after(0, lambda: progress_bar.pack_forget())
-                app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+                post_ui(reset_download_controls)
                 return
+            if file_size > 0:
+                add_to_archive(url, current_format)
             total_size_mb += file_size
         
         if total_size_mb == 0:
-            format_display = current_format.upper()
-            app.after(0, lambda: progress_bar.pack_forget())
-            app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+            post_ui(reset_download_controls)
             return
         
         end_time = time.time()
         duration_seconds = end_time - start_time
         
-        format_display = current_format.upper()
-        app.after(0, lambda: progress_bar.pack_forget())
-        app.after(0, lambda: status_label.configure(text="✅ Download completed successfully!"))
-        app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
-        app.after(0, lambda: pulse_button())
+        set_status("✅ Download completed successfully!")
+        post_ui(reset_download_controls)
+        post_ui(pulse_button)
         
     except Exception as e:
         handle_download_error(e)
@@ -1150,44 +2167,344 @@ def show_audio_quality_selection_popup(url, available_formats):
     
     return selected_quality["quality"]
 
+INFO_CACHE_MAX_ENTRIES = 64
+INFO_CACHE_DEFAULT_TTL = 3600
+INFO_CACHE_EXPIRY_MARGIN = 300
+
+PREFETCH_MAX_URLS = 20
+
+info_cache = OrderedDict()
+info_cache_lock = threading.Lock()
+info_extractions = {}
+
+def extract_video_id(url):
+    video_id_patterns = [
+        r'[?&]v=([a-zA-Z0-9_-]{11})',
+        r'youtu\.be/([a-zA-Z0-9_-]{11})',
+        r'youtube\.com/(?:shorts|embed|live)/([a-zA-Z0-9_-]{11})'
+    ]
+    
+    for pattern in video_id_patterns:
+        match = re.search(pattern, url)
+        if match:
+            return match.group(1)
+    
+    return None
+
+def get_info_expiry(info):
+    """Return the timestamp at which the format URLs in info stop working"""
+    expiry_times = []
+    for fmt in info.get('formats') or []:
+        match = re.search(r'[/?&]expire[=/](\d+)', fmt.get('url') or '')
+        if match:
+            expiry_times.append(int(match.group(1)))
+    
+    if expiry_times:
+        return min(expiry_times) - INFO_CACHE_EXPIRY_MARGIN
+    return time.time() + INFO_CACHE_DEFAULT_TTL
+
+def get_cached_info(url):
+    cache_key = extract_video_id(url) or url
+    with info_cache_lock:
+        cached = info_cache.get(cache_key)
+        if cached is None:
+            return None
+        
+        if cached['expires_at'] <= time.time():
+            del info_cache[cache_key]
+            return None
+        
+        info_cache.move_to_end(cache_key)
+        return cached['info']
+
+def cache_info(url, info):
+    cache_key = extract_video_id(url) or url
+    with info_cache_lock:
+        info_cache[cache_key] = {'info': info, 'expires_at': get_info_expiry(info)}
+        info_cache.move_to_end(cache_key)
+        
+        now = time.time()
+        for key in [k for k, v in info_cache.items() if v['expires_at'] <= now]:
+            del info_cache[key]
+        
+        while len(info_cache) > INFO_CACHE_MAX_ENTRIES:
+            info_cache.popitem(last=False)
+
+def extract_video_info(url):
+    """Extract video info once and share it between metadata, popups and download;
+    callers asking for a URL that is already being extracted wait for that extraction"""
+    info = get_cached_info(url)
+    if info is not None:
+        return info
+    
+    cache_key = extract_video_id(url) or url
+    with info_cache_lock:
+        extraction = info_extractions.get(cache_key)
+        is_owner = extraction is None
+        if is_owner:
+            extraction = Future()
+            info_extractions[cache_key] = extraction
+    
+    if not is_owner:
+        return extraction.result()
+    
+    try:
+        # The cache is keyed by video ID, so a watch?v=...&list=... URL must resolve to the video alone
+        with pooled_ydl({'quiet': True, 'no_warnings': True, 'noplaylist': True}) as ydl:
+            info = ydl.extract_info(url, download=False)
+        
+        if info:
+            cache_info(url, info)
+            store_video_metadata(url, info)
+        extraction.set_result(info)
+        return info
+    except Exception as e:
+        extraction.set_exception(e)
+        raise
+    finally:
+        with info_cache_lock:
+            info_extractions.pop(cache_key, None)
+
+def prefetch_pasted_urls(text):
+    """Start extracting pasted video URLs in the background so Download can start transferring at once"""
+    urls = parse_batch_urls(text) if batch_mode else [text.strip()]
+    urls = [url for url in urls if extract_video_id(url) and not (is_playlist_mode and is_playlist_url(url))]
+    
+    for url in urls[:PREFETCH_MAX_URLS]:
+        if get_cached_info(url) is None:
+            run_in_orchestrator(prefetch_video_info(url, show_preview=len(urls) == 1))
+
+async def prefetch_video_info(url, show_preview=False):
+    try:
+        info = await run_blocking(extract_video_info, url)
+    except Exception as e:
+        print(f"Prefetch failed for {url}: {e}")
+        return
+    
+    if info and show_preview:
+        post_ui(lambda: show_url_preview(url, info))
+
+def show_url_preview(url, info):
+    if textbox.get("0.0", "end-1c").strip() != url or button.cget("state") == "disabled":
+        return
+    
+    duration = int(info.get('duration') or 0)
+    duration_text = f" ({duration // 60}:{duration % 60:02d})" if duration else ""
+    status_label.configure(text=f"🎵 {info.get('title', 'video')}{duration_text}")
+
+def download_with_cached_info(ydl, url):
+    """Download url, reusing a cached extraction instead of fetching the page again"""
+    info = get_cached_info(url)
+    if info is not None and info.get('_type', 'video') == 'video':
+        ydl.process_ie_result(copy.deepcopy(info), download=True)
+    else:
+        ydl.download([url])
+
+METADATA_CACHE_MAX_ENTRIES = 5000
+METADATA_CACHE_DEFAULT_TTL = 24 * 3600
+METADATA_FIELD_TTLS = {
+    'title': 7 * 24 * 3600,
+    'uploader': 30 * 24 * 3600,
+    'duration': 365 * 24 * 3600,
+    'upload_date': 365 * 24 * 3600,
+    'formats': 6 * 3600,
+    'entries': 12 * 3600,
+    'reported_count': 12 * 3600
+}
+VIDEO_METADATA_FIELDS = ['title', 'uploader', 'duration', 'upload_date', 'formats']
+PLAYLIST_METADATA_FIELDS = ['title', 'entries', 'reported_count']
+METADATA_FORMAT_KEYS = [
+    'format_id', 'format_note', 'ext', 'acodec', 'vcodec', 'abr', 'tbr', 'asr',
+    'width', 'height', 'fps', 'resolution', 'quality', 'filesize', 'filesize_approx', 'protocol'
+]
+
+metadata_cache_db = None
+metadata_cache_lock = threading.Lock()
+metadata_cache_counters = {"hits": 0, "misses": 0}
+METADATA_CACHE_FLUSH_BATCH = 50
+metadata_cache_pending_access = {}
+metadata_cache_pending_reads = 0
+
+def get_metadata_cache_db():
+    global metadata_cache_db
+    if metadata_cache_db is None:
+        db_path = os.path.join(get_app_data_dir(), "metadata_cache.db")
+        metadata_cache_db = sqlite3.connect(db_path, check_same_thread=False)
+        metadata_cache_db.execute("PRAGMA journal_mode=WAL")
+        metadata_cache_db.execute("PRAGMA synchronous=NORMAL")
+        metadata_cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS metadata ("
+            "cache_key TEXT, field TEXT, value TEXT, stored_at REAL, PRIMARY KEY (cache_key, field))"
+        )
+        metadata_cache_db.execute("CREATE TABLE IF NOT EXISTS access (cache_key TEXT PRIMARY KEY, last_access REAL)")
+        metadata_cache_db.execute("CREATE INDEX IF NOT EXISTS access_by_time ON access (last_access)")
+        metadata_cache_db.execute("CREATE TABLE IF NOT EXISTS counters (name TEXT PRIMARY KEY, value INTEGER)")
+        metadata_cache_db.execute(
+            "CREATE TABLE IF NOT EXISTS playlist_sync ("
+            "playlist_id TEXT, entry_id TEXT, seen_at REAL, PRIMARY KEY (playlist_id, entry_id))"
+        )
+        for name, value in metadata_cache_db.execute("SELECT name, value FROM counters"):
+            metadata_cache_counters[name] = value
+        metadata_cache_db.commit()
+    return metadata_cache_db
+
+def load_cached_metadata(cache_key, fields):
+    """Return the cached fields for cache_key, or None if any of them is missing or stale"""
+    global metadata_cache_pending_reads
+    try:
+        with metadata_cache_lock:
+            db = get_metadata_cache_db()
+            placeholders = ", ".join("?" for _ in fields)
+            rows = db.execute(
+                f"SELECT field, value, stored_at FROM metadata WHERE cache_key = ? AND field IN ({placeholders})",
+                [cache_key] + fields
+            ).fetchall()
+            
+            now = time.time()
+            values = {}
+            for field, value, stored_at in rows:
+                if now - stored_at <= METADATA_FIELD_TTLS.get(field, METADATA_CACHE_DEFAULT_TTL):
+                    values[field] = json.loads(value)
+            
+            counter = "hits" if len(values) == len(fields) else "misses"
+            metadata_cache_counters[counter] += 1
+            if counter == "hits":
+                metadata_cache_pending_access[cache_key] = now
+            
+            # Reads stay reads; counters and access times are written once per batch
+            metadata_cache_pending_reads += 1
+            if metadata_cache_pending_reads >= METADATA_CACHE_FLUSH_BATCH:
+                write_metadata_cache_counters(db)
+                db.commit()
+            
+            return values if counter == "hits" else None
+    except Exception as e:
+        print(f"Error reading metadata cache: {e}")
+    
+    return None
+
+def write_metadata_cache_counters(db):
+    """Write the batched hit/miss counters and access times; call with metadata_cache_lock held"""
+    global metadata_cache_pending_reads
+    if not metadata_cache_pending_reads:
+        return
+    db.executemany(
+        "INSERT INTO counters (name, value) VALUES (?, ?) ON CONFLICT(name) DO UPDATE SET value = excluded.value",
+        list(metadata_cache_counters.items())
+    )
+    db.executemany(
+        "UPDATE access SET last_access = ? WHERE cache_key = ?",
+        [(last_access, cache_key) for cache_key, last_access in metadata_cache_pending_access.items()]
+    )
+    metadata_cache_pending_access.clear()
+    metadata_cache_pending_reads = 0
+
+def flush_metadata_cache():
+    try:
+        with metadata_cache_lock:
+            if metadata_cache_db is not None:
+                write_metadata_cache_counters(metadata_cache_db)
+                metadata_cache_db.commit()
+    except Exception as e:
+        print(f"Error flushing metadata cache: {e}")
+
+atexit.register(flush_metadata_cache)
+
+def store_metadata(cache_key, values):
+    try:
+        with metadata_cache_lock:
+            db = get_metadata_cache_db()
+            now = time.time()
+            db.executemany(
+                "INSERT OR REPLACE INTO metadata (cache_key, field, value, stored_at) VALUES (?, ?, ?, ?)",
+                [(cache_key, field, json.dumps(value), now) for field, value in values.items()]
+            )
+            db.execute("INSERT OR REPLACE INTO access (cache_key, last_access) VALUES (?, ?)", (cache_key, now))
+            metadata_cache_pending_access.pop(cache_key, None)
+            write_metadata_cache_counters(db)
+            
+            entry_count = db.execute("SELECT COUNT(*) FROM access").fetchone()[0]
+            if entry_count > METADATA_CACHE_MAX_ENTRIES:
+                evicted = [row[0] for row in db.execute(
+                    "SELECT cache_key FROM access ORDER BY last_access LIMIT ?",
+                    (entry_count - METADATA_CACHE_MAX_ENTRIES,)
+                )]
+                db.executemany("DELETE FROM metadata WHERE cache_key = ?", [(key,) for key in evicted])
+                db.executemany("DELETE FROM access WHERE cache_key = ?", [(key,) for key in evicted])
+            db.commit()
+    except Exception as e:
+        print(f"Error writing metadata cache: {e}")
+
+def store_video_metadata(url, info):
+    cache_key = extract_video_id(url) or info.get('id')
+    if not cache_key:
+        return
+    
+    formats = [
+        {key: fmt[key] for key in METADATA_FORMAT_KEYS if key in fmt}
+        for fmt in info.get('formats') or []
+    ]
+    store_metadata(cache_key, {
+        'title': info.get('title', 'video'),
+        'uploader': info.get('uploader', 'Unknown'),
+        'duration': info.get('duration', 0),
+        'upload_date': info.get('upload_date', ''),
+        'formats': formats
+    })
+
+def get_video_metadata(url):
+    """Return title, uploader, duration, upload_date and formats without extracting when possible"""
+    info = get_cached_info(url)
+    if info is not None:
+        return info
+    
+    cache_key = extract_video_id(url)
+    if cache_key:
+        cached = load_cached_metadata(cache_key, VIDEO_METADATA_FIELDS)
+        if cached:
+            return cached
+    
+    return extract_video_info(url)
+
+def get_metadata_cache_stats():
+    try:
+        with metadata_cache_lock:
+            get_metadata_cache_db()
+    except Exception as e:
+        print(f"Error opening metadata cache: {e}")
+    return dict(metadata_cache_counters)
+
 def get_available_audio_formats(url):
     """Get available audio formats for the URL"""
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'ignoreerrors': True,
-        }
+        info = get_video_metadata(url)
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+        if info and 'formats' in info:
+            audio_formats = []
+            for fmt in info['formats']:
+                if (fmt.get('acodec') != 'none' and 
+                    fmt.get('acodec') and
+                    fmt.get('vcodec') == 'none'):
+                    audio_formats.append(fmt)
             
-            if info and 'formats' in info:
-                audio_formats = []
-                for fmt in info['formats']:
-                    if (fmt.get('acodec') != 'none' and 
-                        fmt.get('acodec') and
-                        fmt.get('vcodec') == 'none'):
-                        audio_formats.append(fmt)
-                
-                unique_formats = {}
-                for fmt in audio_formats:
-                    quality_key = fmt.get('quality', 0)
-                    abr = fmt.get('abr', 0)
-                    
-                    if abr:
-                        key = f"{int(abr)}k"
-                    elif quality_key:
-                        key = f"quality_{int(quality_key)}"
-                    else:
-                        key = fmt.get('format_id', 'unknown')
-                    
-                    if key not in unique_formats or (fmt.get('abr', 0) > unique_formats[key].get('abr', 0)):
-                        unique_formats[key] = fmt
+            unique_formats = {}
+            for fmt in audio_formats:
+                quality_key = fmt.get('quality', 0)
+                abr = fmt.get('abr', 0)
                 
-                sorted_formats = sorted(unique_formats.values(), key=lambda x: x.get('abr', 0), reverse=True)
+                if abr:
+                    key = f"{int(abr)}k"
+                elif quality_key:
+                    key = f"quality_{int(quality_key)}"
+                else:
+                    key = fmt.get('format_id', 'unknown')
                 
-                return sorted_formats
+                if key not in unique_formats or (fmt.get('abr', 0) > unique_formats[key].get('abr', 0)):
+                    unique_formats[key] = fmt
+            
+            sorted_formats = sorted(unique_formats.values(), key=lambda x: x.get('abr', 0), reverse=True)
+            
+            return sorted_formats
     except Exception as e:
         print(f"Error getting audio formats: {e}")
     
@@ -1196,39 +2513,81 @@ def get_available_audio_formats(url):
 def get_available_video_formats(url):
     """Get available video formats for the URL"""
     try:
-        ydl_opts = {
-            'quiet': True,
-            'no_warnings': True,
-            'ignoreerrors': True,
-        }
+        info = get_video_metadata(url)
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
+        if info and 'formats' in info:
+            video_formats = []
+            for fmt in info['formats']:
+                if (fmt.get('vcodec') != 'none' and 
+                    fmt.get('vcodec') and
+                    fmt.get('height') and 
+                    fmt.get('width') and
+                    fmt.get('height') >= 240):
+                    video_formats.append(fmt)
             
-            if info and 'formats' in info:
-                video_formats = []
-                for fmt in info['formats']:
-                    if (fmt.get('vcodec') != 'none' and 
-                        fmt.get('vcodec') and
-                        fmt.get('height') and 
-                        fmt.get('width') and
-                        fmt.get('height') >= 240):
-                        video_formats.append(fmt)
-                
-                unique_formats = {}
-                for fmt in video_formats:
-                    key = f"{fmt.get('width')}x{fmt.get('height')}"
-                    if key not in unique_formats or fmt.get('tbr', 0) > unique_formats[key].get('tbr', 0):
-                        unique_formats[key] = fmt
-                
-                sorted_formats = sorted(unique_formats.values(), key=lambda x: x.get('height', 0), reverse=True)
-                
-                return sorted_formats
+            unique_formats = {}
+            for fmt in video_formats:
+                key = f"{fmt.get('width')}x{fmt.get('height')}"
+                if key not in unique_formats or fmt.get('tbr', 0) > unique_formats[key].get('tbr', 0):
+                    unique_formats[key] = fmt
+            
+            sorted_formats = sorted(unique_formats.values(), key=lambda x: x.get('height', 0), reverse=True)
+            
+            return sorted_formats
     except Exception as e:
         print(f"Error getting video formats: {e}")
     
     return []
 
+def get_video_codec_family(vcodec):
+    return (vcodec or '').split('.')[0]
+
+def make_video_format_policy(format_id, available_formats):
+    """Turn the format picked for one video into a height/fps/codec policy that any other video can satisfy"""
+    chosen = next((fmt for fmt in available_formats if fmt.get('format_id') == format_id), None)
+    if chosen is None:
+        return format_id
+    
+    return {
+        'max_height': chosen.get('height'),
+        'max_fps': chosen.get('fps'),
+        'vcodec': get_video_codec_family(chosen.get('vcodec')),
+        'ext': chosen.get('ext')
+    }
+
+def resolve_video_format(formats, policy):
+    """Pick the format_id from a video's own formats that best matches a playlist format policy"""
+    candidates = [fmt for fmt in formats or []
+                  if fmt.get('format_id') and fmt.get('height') and fmt.get('vcodec') not in [None, 'none']]
+    max_height = policy.get('max_height')
+    max_fps = policy.get('max_fps')
+    
+    fitting = [fmt for fmt in candidates
+               if (not max_height or fmt['height'] <= max_height) and (not max_fps or (fmt.get('fps') or 0) <= max_fps)]
+    if not fitting and candidates:
+        # Everything is above the chosen quality, take the smallest rather than failing
+        fitting = [min(candidates, key=lambda fmt: (fmt['height'], fmt.get('fps') or 0))]
+    if not fitting:
+        return None
+    
+    best = max(fitting, key=lambda fmt: (
+        fmt['height'],
+        fmt.get('fps') or 0,
+        get_video_codec_family(fmt.get('vcodec')) == policy.get('vcodec'),
+        fmt.get('ext') == policy.get('ext'),
+        fmt.get('tbr') or 0
+    ))
+    return best['format_id']
+
+def get_policy_format_spec(policy):
+    """yt-dlp format string for a policy, used when a video's formats are not known up front"""
+    filters = ""
+    if policy.get('max_height'):
+        filters += f"[height<={policy['max_height']}]"
+    if policy.get('max_fps'):
+        filters += f"[fps<={policy['max_fps']}]"
+    return f"bestvideo{filters}+bestaudio/best{filters}/best"
+
 def format_selector(ctx):
     """ Select the best video and the best audio that won't result in an mkv.
     NOTE: This is just an example and does not handle all cases """
@@ -1249,235 +2608,674 @@ def format_selector(ctx):
         'protocol': f'{best_video["protocol"]}+{best_audio["protocol"]}'
     }
 
-def download_single_video(url, ffmpeg_path, preset_video_format=None, preset_audio_format=None):
+TRANSCODE_WORKERS = os.cpu_count() or 2
+TRANSCODE_BACKLOG_LIMIT = TRANSCODE_WORKERS * 2
+
+class TranscodePipeline:
+    """Runs ffmpeg conversions on a CPU-sized pool so downloaders never wait for them"""
     
+    def __init__(self, download_workers):
+        self.executor = ThreadPoolExecutor(max_workers=TRANSCODE_WORKERS)
+        self.slots = threading.BoundedSemaphore(download_workers + TRANSCODE_BACKLOG_LIMIT)
+    
+    def reserve(self):
+        self.slots.acquire()
+    
+    def release(self):
+        self.slots.release()
+    
+    def submit(self, task):
+        return self.executor.submit(self.transcode, task)
+    
+    def transcode(self, task):
+        try:
+            return transcode_downloaded_file(task)
+        finally:
+            self.release()
+    
+    def shutdown(self):
+        self.executor.shutdown(wait=True)
+
+DOWNLOAD_PROGRESS_SHARE = 0.85
+
+YDL_SESSION_MAX_JOBS = 200
+# yt-dlp reads these when a YoutubeDL is created or builds its HTTP handlers on the first request,
+# so a session is only reused by jobs that ask for the same values
+YDL_SESSION_PARAMS = [
+    'socket_timeout', 'proxy', 'source_address', 'nocheckcertificate', 'http_headers',
+    'cookiefile', 'cookiesfrombrowser', 'impersonate', 'legacyserverconnect'
+]
+
+ydl_sessions = threading.local()
+
+# Reusing a YoutubeDL depends on these yt-dlp internals; check them when upgrading yt-dlp:
+# params, _progress_hooks, _pps, add_post_processor, build_format_selector, format_selector,
+# outtmpl_dict/parse_outtmpl (older versions) and postprocessor.get_postprocessor
+def apply_ydl_overrides(ydl, overrides):
+    params = {key: value for key, value in overrides.items() if key not in YDL_SESSION_PARAMS}
+    progress_hooks = params.pop('progress_hooks', None) or []
+    if isinstance(params.get('outtmpl'), str):
+        params['outtmpl'] = {'default': params['outtmpl']}
+    ydl.params.update(params)
+    if hasattr(ydl, 'outtmpl_dict'):
+        # Older yt-dlp versions parse the output template once in __init__
+        ydl.outtmpl_dict = ydl.parse_outtmpl()
+    
+    # yt-dlp builds the format selector and the postprocessor chain in __init__, so rebuild both from the params
+    format_spec = ydl.params.get('format')
+    if format_spec in (None, '-') or callable(format_spec):
+        ydl.format_selector = format_spec
+    else:
+        ydl.format_selector = ydl.build_format_selector(format_spec)
+    
+    ydl._pps = {when: [] for when in ydl._pps}
+    for postprocessor_def in ydl.params.get('postprocessors', []):
+        postprocessor_def = dict(postprocessor_def)
+        when = postprocessor_def.pop('when', 'post_process')
+        postprocessor_class = yt_dlp.postprocessor.get_postprocessor(postprocessor_def.pop('key'))
+        ydl.add_post_processor(postprocessor_class(ydl, **postprocessor_def), when=when)
+    
+    ydl._progress_hooks = list(progress_hooks)
+
+@contextmanager
+def pooled_ydl(overrides):
+    """Borrow this worker thread's long-lived YoutubeDL with overrides applied for one job,
+    so HTTP connections, cookies and extractor caches carry over between jobs"""
+    if getattr(ydl_sessions, 'in_use', False):
+        with yt_dlp.YoutubeDL(overrides) as ydl:
+            yield ydl
+        return
+    
+    session_params = {key: overrides[key] for key in YDL_SESSION_PARAMS if key in overrides}
+    session = getattr(ydl_sessions, 'session', None)
+    if session is None or ydl_sessions.jobs >= YDL_SESSION_MAX_JOBS or ydl_sessions.params != session_params:
+        if session is not None:
+            try:
+                session.__exit__(None, None, None)
+            except Exception as e:
+                print(f"Error closing yt-dlp session: {e}")
+        session = yt_dlp.YoutubeDL(dict(session_params))
+        ydl_sessions.session = session
+        ydl_sessions.params = session_params
+        ydl_sessions.jobs = 0
+    
+    base_params = dict(session.params)
+    base_progress_hooks = session._progress_hooks
+    ydl_sessions.in_use = True
+    ydl_sessions.jobs += 1
     try:
-        with tempfile.TemporaryDirectory() as temp_dir:
-            temp_output = os.path.join(temp_dir, "temp_file.%(ext)s")
-            video_title = None
-            safe_title = None
-            uploader = 'Unknown'
-            duration = 0
-            upload_date = ''
-            info_extraction_failed = False
+        apply_ydl_overrides(session, overrides)
+        yield session
+    finally:
+        session.params.clear()
+        session.params.update(base_params)
+        apply_ydl_overrides(session, {})
+        session._progress_hooks = base_progress_hooks
+        ydl_sessions.in_use = False
+
+def get_network_ydl_opts():
+    """yt-dlp transfer options from the network settings"""
+    network_opts = {
+        'continuedl': True,
+        'concurrent_fragment_downloads': max(1, concurrent_fragment_downloads),
+        'buffersize': buffer_size_kb * 1024,
+    }
+    if http_chunk_size_mb > 0:
+        network_opts['http_chunk_size'] = http_chunk_size_mb * 1024 * 1024
+    return network_opts
+
+BANDWIDTH_PRIORITY_WEIGHTS = {'single': 4, 'batch': 2, 'cli': 2, 'api': 2, 'playlist': 1}
+BANDWIDTH_BURST_SECONDS = 0.5
+BANDWIDTH_IDLE_SECONDS = 2.0
+BANDWIDTH_MAX_SLEEP = 0.25
+
+class BandwidthLimiter:
+    """Token bucket shared by every download; the cap is split between active downloads by priority weight"""
+    
+    def __init__(self):
+        self.limit = 0
+        self.lock = threading.Lock()
+        self.consumers = {}
+    
+    def set_limit(self, limit):
+        with self.lock:
+            self.limit = max(0, limit)
+            for state in self.consumers.values():
+                state['tokens'] = 0.0
+    
+    def refill(self, state, now):
+        active_weight = sum(other['weight'] for other in self.consumers.values()
+                            if now - other['last_seen'] < BANDWIDTH_IDLE_SECONDS)
+        share = self.limit * state['weight'] / max(active_weight, state['weight'])
+        state['tokens'] = min(share * BANDWIDTH_BURST_SECONDS, state['tokens'] + (now - state['updated_at']) * share)
+        state['updated_at'] = now
+        return share
+    
+    def throttle(self, consumer, weight, byte_count):
+        """Block the calling download until its share of the cap covers byte_count more bytes"""
+        with self.lock:
+            if not self.limit:
+                return
+            now = time.monotonic()
+            state = self.consumers.setdefault(consumer, {'tokens': 0.0, 'updated_at': now})
+            state['weight'] = weight
+            state['last_seen'] = now
+            self.refill(state, now)
+            state['tokens'] -= byte_count
+        
+        while True:
+            with self.lock:
+                if not self.limit or consumer not in self.consumers:
+                    return
+                now = time.monotonic()
+                state['last_seen'] = now
+                share = self.refill(state, now)
+                if state['tokens'] >= 0:
+                    return
+                delay = -state['tokens'] / share
+            time.sleep(min(delay, BANDWIDTH_MAX_SLEEP))
+    
+    def release(self, consumer):
+        with self.lock:
+            self.consumers.pop(consumer, None)
+
+bandwidth_limiter = BandwidthLimiter()
+
+def make_bandwidth_hook(priority):
+    """Progress hook that holds yt-dlp back while the download is over its share of the bandwidth limit"""
+    consumer = object()
+    weight = BANDWIDTH_PRIORITY_WEIGHTS.get(priority, 1)
+    downloaded_bytes = {}
+    
+    def bandwidth_hook(d):
+        if d['status'] == 'downloading':
+            filename = d.get('filename')
+            current_bytes = d.get('downloaded_bytes') or 0
+            # The first report of a resumed file includes bytes fetched earlier, only count new ones
+            previous_bytes = downloaded_bytes.setdefault(filename, current_bytes)
+            downloaded_bytes[filename] = max(previous_bytes, current_bytes)
+            if current_bytes > previous_bytes:
+                bandwidth_limiter.throttle(consumer, weight, current_bytes - previous_bytes)
+        else:
+            bandwidth_limiter.release(consumer)
+    
+    return bandwidth_hook
+
+def make_progress_hook(progress_callback):
+    """Turn yt-dlp progress events into one 0..1 fraction across all requested streams"""
+    finished_files = []
+    
+    def progress_hook(d):
+        info = d.get('info_dict') or {}
+        stream_count = len(info.get('requested_formats') or []) or 1
+        
+        if d['status'] == 'finished':
+            if d.get('filename') not in finished_files:
+                finished_files.append(d.get('filename'))
+            fraction = 0.0
+        elif d['status'] == 'downloading':
+            total_bytes = d.get('total_bytes') or d.get('total_bytes_estimate')
+            if total_bytes:
+                fraction = d.get('downloaded_bytes', 0) / total_bytes
+            elif d.get('fragment_count'):
+                fraction = d.get('fragment_index', 0) / d['fragment_count']
+            else:
+                return
+        else:
+            return
+        
+        progress_callback(min(1.0, (len(finished_files) + fraction) / stream_count))
+    
+    return progress_hook
+
+def run_ffmpeg(cmd, duration=0, progress_callback=None):
+    startupinfo = hide_console_window()
+    popen_kwargs = {'startupinfo': startupinfo} if startupinfo else {}
+    
+    if not (progress_callback and duration):
+        subprocess.run(cmd, check=True, capture_output=True, **popen_kwargs)
+        return
+    
+    cmd = [cmd[0], '-progress', 'pipe:1', '-nostats'] + cmd[1:]
+    with tempfile.TemporaryFile() as stderr_file:
+        process = subprocess.Popen(cmd, stdin=subprocess.DEVNULL, stdout=subprocess.PIPE, stderr=stderr_file, **popen_kwargs)
+        for raw_line in process.stdout:
+            key, _, value = raw_line.decode('utf-8', errors='replace').strip().partition('=')
+            if key in ('out_time_us', 'out_time_ms') and value.isdigit():
+                progress_callback(min(1.0, int(value) / (duration * 1000000)))
+        process.wait()
+        
+        if process.returncode != 0:
+            stderr_file.seek(0)
+            raise subprocess.CalledProcessError(process.returncode, cmd, stderr=stderr_file.read())
+
+REMUX_SOURCE_CODECS = {
+    'm4a': ['aac', 'alac'],
+    'mp3': ['mp3'],
+    'flac': ['flac']
+}
+REMUX_FORMAT_FILTERS = {
+    'm4a': '[acodec^=mp4a]',
+    'mp3': '[acodec=mp3]',
+    'flac': '[acodec=flac]'
+}
+LOSSLESS_CODECS = ['alac', 'flac']
+
+def get_audio_format_spec(output_format, quality):
+    """Prefer a source stream that can be remuxed into output_format without re-encoding"""
+    codec_filter = REMUX_FORMAT_FILTERS.get(output_format)
+    if codec_filter:
+        return f'bestaudio{codec_filter}[abr<=?{quality}]/bestaudio/best'
+    return 'bestaudio/best'
+
+def probe_audio_stream(ffmpeg_path, file_path):
+    """Read codec and bitrate of the first audio stream from ffmpeg's input banner"""
+    try:
+        cmd = [ffmpeg_path, '-hide_banner', '-i', file_path]
+        startupinfo = hide_console_window()
+        if startupinfo:
+            result = subprocess.run(cmd, capture_output=True, startupinfo=startupinfo)
+        else:
+            result = subprocess.run(cmd, capture_output=True)
+        
+        for line in result.stderr.decode('utf-8', errors='replace').splitlines():
+            match = re.search(r'Stream #.*Audio: (\w+)', line)
+            if match:
+                bitrate_match = re.search(r'(\d+) kb/s', line)
+                return {
+                    'codec': match.group(1),
+                    'bitrate': int(bitrate_match.group(1)) if bitrate_match else None
+                }
+    except Exception as e:
+        print(f"Error probing {file_path}: {e}")
+    
+    return None
+
+def can_stream_copy(output_format, probe, quality):
+    """Copying is lossless; only re-encode when the user asked for a noticeably smaller bitrate"""
+    if not probe or probe['codec'] not in REMUX_SOURCE_CODECS.get(output_format, []):
+        return False
+    if probe['codec'] in LOSSLESS_CODECS or not probe['bitrate']:
+        return True
+    return probe['bitrate'] <= int(quality) * 1.1
+
+def transcode_downloaded_file(task):
+    """Convert a finished download to its output format, record it and remove its temp dir"""
+    try:
+        ffmpeg_path = task['ffmpeg_path']
+        temp_file = task['temp_file']
+        final_output = task['final_output']
+        output_format = task['format']
+        safe_title = task['safe_title']
+        uploader = task['uploader']
+        upload_date = task['upload_date']
+        progress_callback = task['progress_callback']
+        
+        transcode_started_at = time.perf_counter()
+        
+        def report_transcode_progress(fraction):
+            if progress_callback:
+                progress_callback(DOWNLOAD_PROGRESS_SHARE + fraction * (1 - DOWNLOAD_PROGRESS_SHARE))
+        
+        if output_format == "mkv":
+            set_status("🔄 Converting to MKV...")
             
-            try:
-                with yt_dlp.YoutubeDL({'quiet': True, 'no_warnings': True}) as ydl:
-                    info = ydl.extract_info(url, download=False)
-                    video_title = info.get('title', 'video')
-                    safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
-                    
-                    uploader = info.get('uploader', 'Unknown')
-                    duration = info.get('duration', 0)
-                    upload_date = info.get('upload_date', '')
-            except Exception as info_error:
-                print(f"Failed to get video info: {info_error}")
-                info_extraction_failed = True
-                error_msg = str(info_error).lower()
-                audio_fallback_triggers = [
-                    "video unavailable", "not available", "private video", 
-                    "deleted", "removed", "blocked", "age restricted",
-                    "sign in to confirm", "music", "audio only", "no video"
-                ]
-                
-                if any(trigger in error_msg for trigger in audio_fallback_triggers):
-                    app.after(0, lambda: status_label.configure(text="⚠️ Video issue detected, trying audio download..."))
-                    return download_as_audio_fallback(url, ffmpeg_path, temp_dir)
-                
-                safe_title = f"video_{int(time.time())}"
-                                
-            if current_format in ["mkv", "mp4"]:
-                selected_format_id = preset_video_format
-                
-                if selected_format_id is None and show_resolution_popup:
-                    app.after(0, lambda: status_label.configure(text="🔍 Getting available resolutions..."))
-                    available_formats = get_available_video_formats(url)
-                    
-                    if available_formats:
-                        result_container = {"format_id": None, "completed": False}
-                        
-                        def show_popup():
-                            result_container["format_id"] = show_resolution_selection_popup(url, available_formats)
-                            result_container["completed"] = True
-                        
-                        app.after(0, show_popup)
-                        
-                        while not result_container["completed"]:
-                            time.sleep(0.1)
-                        
-                        selected_format_id = result_container["format_id"]
-                        
-                        if not selected_format_id:
-                            app.after(0, lambda: status_label.configure(text="❌ Download cancelled"))
-                            return "CANCELLED"
-                    else:
-                        app.after(0, lambda: status_label.configure(text="⚠️ No video formats found, using default..."))
-                        selected_format_id = None
-                
-                if selected_format_id:
-                    ydl_opts = {
-                        'format': f'{selected_format_id}+bestaudio/best',
-                        'outtmpl': os.path.join(temp_dir, "temp_file.%(ext)s"),
-                    }
-                else:
-                    ydl_opts = {
-                        'format': format_selector,
-                        'outtmpl': os.path.join(temp_dir, "temp_file.%(ext)s"),
-                    }
-                
-                app.after(0, lambda: status_label.configure(text="⬇️ Downloading video..."))
-                
-                try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
-                except Exception as download_error:
-                    error_msg = str(download_error).lower()
-                    if "not available" in error_msg or "unavailable" in error_msg or "private" in error_msg:
-                        app.after(0, lambda: status_label.configure(text="⚠️ Video download failed, trying audio..."))
-                        return download_as_audio_fallback(url, ffmpeg_path, temp_dir)
-                    else:
-                        raise download_error
+            cmd = [ffmpeg_path, '-i', temp_file, '-c', 'copy']
+            if task['preserve_metadata']:
+                cmd.extend(['-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}'])
+            cmd.append(final_output)
+            run_ffmpeg(cmd, task['duration'], report_transcode_progress)
+        elif output_format == "mp4":
+            set_status("🔄 Processing MP4...")
+            if task['preserve_metadata']:
+                cmd = [ffmpeg_path, '-i', temp_file, '-c', 'copy', 
+                       '-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}', final_output]
+                run_ffmpeg(cmd, task['duration'], report_transcode_progress)
+            else:
+                shutil.copy2(temp_file, final_output)
+        else:
+            set_status(f"🔄 Converting to {output_format.upper()}...")
+            
+            codec_map = {
+                'mp3': 'libmp3lame',
+                'wav': 'pcm_s16le',
+                'flac': 'flac',
+                'm4a': 'aac'
+            }
+            
+            probe = probe_audio_stream(ffmpeg_path, temp_file)
+            if can_stream_copy(output_format, probe, task['quality']):
+                set_status(f"⚡ Remuxing {probe['codec'].upper()} to {output_format.upper()}...")
+                cmd = [ffmpeg_path, '-i', temp_file, '-vn', '-c:a', 'copy']
+            else:
+                codec = codec_map.get(output_format, 'libmp3lame')
+                cmd = [ffmpeg_path, '-i', temp_file, '-acodec', codec]
                 
-                temp_files = [f for f in os.listdir(temp_dir) if f.startswith("temp_file")]
-                if temp_files:
-                    temp_file = os.path.join(temp_dir, temp_files[0])
-                    final_output = os.path.join(current_download_folder, f"{safe_title}.{current_format}")
-                    
-                    if current_format == "mkv":
-                        app.after(0, lambda: status_label.configure(text="🔄 Converting to MKV..."))
-                        
-                        cmd = [ffmpeg_path, '-i', temp_file, '-c', 'copy']
-                        if preserve_metadata:
-                            cmd.extend(['-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}'])
-                        cmd.append(final_output)
-                        
-                        startupinfo = hide_console_window()
-                        if startupinfo:
-                            subprocess.run(cmd, check=True, capture_output=True, startupinfo=startupinfo)
-                        else:
-                            subprocess.run(cmd, check=True, capture_output=True)
-                    else:
-                        app.after(0, lambda: status_label.configure(text="🔄 Processing MP4..."))
-                        if preserve_metadata:
-                            cmd = [ffmpeg_path, '-i', temp_file, '-c', 'copy', 
-                                   '-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}', final_output]
-                            startupinfo = hide_console_window()
-                            if startupinfo:
-                                subprocess.run(cmd, check=True, capture_output=True, startupinfo=startupinfo)
-                            else:
-                                subprocess.run(cmd, check=True, capture_output=True)
-                        else:
-                            shutil.copy2(temp_file, final_output)
-                    
-                    file_size_mb = os.path.getsize(final_output) / (1024 * 1024)
-                    
-                    add_to_history(safe_title, current_format.upper(), final_output)
-                    update_download_stats(file_size_mb, duration)
-                    
-                    app.after(0, lambda: status_label.configure(text="✅ Video download completed!"))
-                    return file_size_mb
-                    
+                if output_format in ['mp3', 'm4a']:
+                    cmd.extend(['-ab', f"{task['quality']}k"])
+            
+            if task['preserve_metadata']:
+                cmd.extend(['-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}'])
+                if upload_date:
+                    cmd.extend(['-metadata', f'date={upload_date[:4]}'])
+            
+            cmd.append(final_output)
+            run_ffmpeg(cmd, task['duration'], report_transcode_progress)
+        
+        report_transcode_progress(1.0)
+        file_size_mb = os.path.getsize(final_output) / (1024 * 1024)
+        
+        timings = task.get('timings', {})
+        finished_at = time.perf_counter()
+        timings['transcode'] = finished_at - transcode_started_at
+        if 'network_started_at' in timings:
+            # Wall time leaves out popups; it does include waiting for a free transcode worker
+            timings['wall'] = timings.get('extract', 0) + finished_at - timings['network_started_at']
+        
+        add_to_history(safe_title, output_format.upper(), final_output)
+        update_download_stats(file_size_mb, task['duration'], output_format, timings)
+        
+        if output_format in ["mkv", "mp4"]:
+            set_status("✅ Video download completed!")
+        else:
+            set_status("✅ Audio download completed!")
+        release_work_dir(task['temp_dir'], remove=True)
+        return file_size_mb
+    except Exception:
+        release_work_dir(task['temp_dir'])
+        raise
+
+PARTIAL_DOWNLOAD_MAX_AGE_DAYS = 7
+PARTIAL_DOWNLOAD_MAX_TOTAL_MB = 10 * 1024
+UNFINISHED_FILE_SUFFIXES = ('.part', '.ytdl', '.tmp', '.temp')
+
+claimed_work_dirs = set()
+work_dirs_lock = threading.Lock()
+
+def get_partial_downloads_dir():
+    partial_dir = os.path.join(get_app_data_dir(), "partial_downloads")
+    os.makedirs(partial_dir, exist_ok=True)
+    return partial_dir
+
+def claim_work_dir(url, output_format):
+    """Return a persistent per-video directory so an interrupted download can resume from its .part files"""
+    video_id = extract_video_id(url) or hashlib.sha1(url.encode('utf-8')).hexdigest()[:16]
+    work_dir = os.path.join(get_partial_downloads_dir(), f"{video_id}_{output_format}")
+    
+    with work_dirs_lock:
+        if work_dir in claimed_work_dirs:
+            return tempfile.mkdtemp(prefix=f"{video_id}_", dir=get_partial_downloads_dir())
+        claimed_work_dirs.add(work_dir)
+    
+    os.makedirs(work_dir, exist_ok=True)
+    os.utime(work_dir)
+    return work_dir
+
+def release_work_dir(work_dir, remove=False):
+    with work_dirs_lock:
+        claimed_work_dirs.discard(work_dir)
+    if remove:
+        shutil.rmtree(work_dir, ignore_errors=True)
+
+def get_work_file_prefix(format_spec):
+    """Separate files per requested format so a resume never appends bytes from a different stream"""
+    return "temp_file_" + hashlib.sha1(str(format_spec).encode('utf-8')).hexdigest()[:10]
+
+def list_finished_work_files(work_dir, file_prefix):
+    return [f for f in os.listdir(work_dir)
+            if f.startswith(file_prefix) and not f.endswith(UNFINISHED_FILE_SUFFIXES)]
+
+def get_dir_size(path):
+    total_size = 0
+    for root, dirs, files in os.walk(path):
+        for name in files:
+            try:
+                total_size += os.path.getsize(os.path.join(root, name))
+            except OSError:
+                pass
+    return total_size
+
+def cleanup_partial_downloads():
+    """Age out abandoned partial downloads, then trim the oldest until the total size fits"""
+    try:
+        partial_dir = get_partial_downloads_dir()
+        now = time.time()
+        work_dirs = []
+        
+        for name in os.listdir(partial_dir):
+            work_dir = os.path.join(partial_dir, name)
+            with work_dirs_lock:
+                if work_dir in claimed_work_dirs:
+                    continue
+            
+            last_used = os.path.getmtime(work_dir)
+            if now - last_used > PARTIAL_DOWNLOAD_MAX_AGE_DAYS * 24 * 3600:
+                shutil.rmtree(work_dir, ignore_errors=True)
+                print(f"Removed abandoned partial download: {name}")
             else:
-                selected_format = preset_audio_format
+                work_dirs.append((last_used, work_dir, get_dir_size(work_dir)))
+        
+        total_size = sum(size for _, _, size in work_dirs)
+        for last_used, work_dir, size in sorted(work_dirs):
+            if total_size <= PARTIAL_DOWNLOAD_MAX_TOTAL_MB * 1024 * 1024:
+                break
+            shutil.rmtree(work_dir, ignore_errors=True)
+            total_size -= size
+            print(f"Removed partial download to free space: {os.path.basename(work_dir)}")
+    except Exception as e:
+        print(f"Error cleaning up partial downloads: {e}")
+
+def download_single_video(url, ffmpeg_path, preset_video_format=None, preset_audio_format=None, pipeline=None, progress_callback=None, priority="single",
+                          output_format=None, quality=None, output_folder=None):
+    output_format = output_format or current_format
+    output_folder = output_folder or current_download_folder
+    temp_dir = claim_work_dir(url, output_format)
+    handed_off = False
+    # Partial downloads stay for the next attempt unless the work is finished or the user cancelled
+    work_dir_done = False
+    if pipeline:
+        pipeline.reserve()
+    
+    progress_hooks = [make_bandwidth_hook(priority)]
+    if progress_callback:
+        progress_hooks.append(make_progress_hook(lambda fraction: progress_callback(fraction * DOWNLOAD_PROGRESS_SHARE)))
+    
+    timings = {}
+    try:
+        info = {}
+        video_title = None
+        safe_title = None
+        uploader = 'Unknown'
+        duration = 0
+        upload_date = ''
+        quality_to_use = quality or current_quality
+        
+        try:
+            extract_started_at = time.perf_counter()
+            info = get_video_metadata(url)
+            timings['extract'] = time.perf_counter() - extract_started_at
+            video_title = info.get('title', 'video')
+            safe_title = "".join(c for c in video_title if c.isalnum() or c in (' ', '-', '_')).rstrip()
+            
+            uploader = info.get('uploader', 'Unknown')
+            duration = info.get('duration', 0)
+            upload_date = info.get('upload_date', '')
+        except Exception as info_error:
+            print(f"Failed to get video info: {info_error}")
+            error_msg = str(info_error).lower()
+            audio_fallback_triggers = [
+                "video unavailable", "not available", "private video", 
+                "deleted", "removed", "blocked", "age restricted",
+                "sign in to confirm", "music", "audio only", "no video"
+            ]
+            
+            if any(trigger in error_msg for trigger in audio_fallback_triggers):
+                set_status("⚠️ Video issue detected, trying audio download...")
+                file_size = download_as_audio_fallback(url, ffmpeg_path, temp_dir, progress_callback, info_error, priority, quality_to_use, output_folder)
+                work_dir_done = file_size > 0
+                return file_size
+            
+            safe_title = f"video_{int(time.time())}"
+                            
+        if output_format in ["mkv", "mp4"]:
+            selected_format_id = preset_video_format
+            format_policy = None
+            
+            if isinstance(preset_video_format, dict):
+                format_policy = preset_video_format
+                selected_format_id = resolve_video_format(info.get('formats'), format_policy)
+            
+            if preset_video_format is None and show_resolution_popup:
+                set_status("🔍 Getting available resolutions...")
+                available_formats = get_available_video_formats(url)
                 
-                if selected_format is None and show_audio_quality_popup and current_format in ["mp3", "wav", "flac", "m4a"]:
-                    app.after(0, lambda: status_label.configure(text="🔍 Getting available audio qualities..."))
-                    available_formats = get_available_audio_formats(url)
-                    
-                    result_container = {"format": None, "completed": False}
-                    
-                    def show_popup():
-                        result_container["format"] = show_audio_quality_selection_popup(url, available_formats)
-                        result_container["completed"] = True
-                    
-                    app.after(0, show_popup)
-                    
-                    while not result_container["completed"]:
-                        time.sleep(0.1)
-                    
-                    selected_format = result_container["format"]
+                if available_formats:
+                    selected_format_id = wait_for_dialog(lambda: show_resolution_selection_popup(url, available_formats))
                     
-                    if not selected_format:
-                        app.after(0, lambda: status_label.configure(text="❌ Download cancelled"))
+                    if not selected_format_id:
+                        set_status("❌ Download cancelled")
+                        work_dir_done = True
                         return "CANCELLED"
-                
-                if selected_format and not selected_format.isdigit():
-                    ydl_opts = {
-                        'format': selected_format,
-                        'outtmpl': temp_output,
-                        'ffmpeg_location': ffmpeg_path,
-                        'noplaylist': True,
-                        'ignoreerrors': True,
-                        'no_warnings': True
-                    }
                 else:
-                    ydl_opts = {
-                        'format': 'bestaudio/best',
-                        'outtmpl': temp_output,
-                        'ffmpeg_location': ffmpeg_path,
-                        'noplaylist': True,
-                        'ignoreerrors': True,
-                        'no_warnings': True
-                    }
+                    set_status("⚠️ No video formats found, using default...")
+                    selected_format_id = None
+            
+            policy_format_spec = get_policy_format_spec(format_policy) if format_policy else None
+            file_prefix = get_work_file_prefix(selected_format_id or policy_format_spec or "auto")
+            temp_output = os.path.join(temp_dir, f"{file_prefix}.%(ext)s")
+            
+            if selected_format_id:
+                ydl_opts = {
+                    'format': f'{selected_format_id}+bestaudio/best',
+                    'outtmpl': temp_output,
+                    'noplaylist': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+            elif policy_format_spec:
+                ydl_opts = {
+                    'format': policy_format_spec,
+                    'outtmpl': temp_output,
+                    'noplaylist': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+            else:
+                ydl_opts = {
+                    'format': format_selector,
+                    'outtmpl': temp_output,
+                    'noplaylist': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+            
+            set_status("⬇️ Downloading video...")
+            timings['network_started_at'] = time.perf_counter()
+            
+            try:
+                with pooled_ydl(ydl_opts) as ydl:
+                    download_with_cached_info(ydl, url)
+            except Exception as download_error:
+                error_msg = str(download_error).lower()
+                if "not available" in error_msg or "unavailable" in error_msg or "private" in error_msg:
+                    set_status("⚠️ Video download failed, trying audio...")
+                    file_size = download_as_audio_fallback(url, ffmpeg_path, temp_dir, progress_callback, download_error, priority, quality_to_use, output_folder)
+                    work_dir_done = file_size > 0
+                    return file_size
+                else:
+                    raise download_error
                 
-                app.after(0, lambda: status_label.configure(text="🎵 Downloading audio..."))
-                
-                try:
-                    with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-                        ydl.download([url])
-                except Exception as download_error:
-                    app.after(0, lambda: status_label.configure(text="⚠️ Standard audio download failed, trying fallback..."))
-                    return download_as_audio_fallback(url, ffmpeg_path, temp_dir)
+        else:
+            selected_format = preset_audio_format
+            
+            if selected_format is None and show_audio_quality_popup and output_format in ["mp3", "wav", "flac", "m4a"]:
+                set_status("🔍 Getting available audio qualities...")
+                available_formats = get_available_audio_formats(url)
+                selected_format = wait_for_dialog(lambda: show_audio_quality_selection_popup(url, available_formats))
                 
-                temp_files = [f for f in os.listdir(temp_dir) if f.startswith("temp_file")]
-                if temp_files:
-                    temp_file = os.path.join(temp_dir, temp_files[0])
-                    final_output = os.path.join(current_download_folder, f"{safe_title}.{current_format}")
-                    
-                    app.after(0, lambda: status_label.configure(text=f"🔄 Converting to {current_format.upper()}..."))
-                    
-                    codec_map = {
-                        'mp3': 'libmp3lame',
-                        'wav': 'pcm_s16le',
-                        'flac': 'flac',
-                        'm4a': 'aac'
-                    }
-                    
-                    codec = codec_map.get(current_format, 'libmp3lame')
-                    cmd = [ffmpeg_path, '-i', temp_file, '-acodec', codec]
-                    
-                    quality_to_use = current_quality
-                    if selected_format and selected_format.isdigit():
-                        quality_to_use = selected_format
-                    
-                    if current_format in ['mp3', 'm4a']:
-                        cmd.extend(['-ab', f'{quality_to_use}k'])
-                    
-                    if preserve_metadata:
-                        cmd.extend(['-metadata', f'title={safe_title}', '-metadata', f'artist={uploader}'])
-                        if upload_date:
-                            cmd.extend(['-metadata', f'date={upload_date[:4]}'])
-                    
-                    cmd.append(final_output)
-                    startupinfo = hide_console_window()
-                    if startupinfo:
-                        subprocess.run(cmd, check=True, capture_output=True, startupinfo=startupinfo)
-                    else:
-                        subprocess.run(cmd, check=True, capture_output=True)
-                    
-                    file_size_mb = os.path.getsize(final_output) / (1024 * 1024)
-                    
-                    add_to_history(safe_title, current_format.upper(), final_output)
-                    update_download_stats(file_size_mb, duration)
-                    
-                    app.after(0, lambda: status_label.configure(text="✅ Audio download completed!"))
-                    return file_size_mb
+                if not selected_format:
+                    set_status("❌ Download cancelled")
+                    work_dir_done = True
+                    return "CANCELLED"
+            
+            if selected_format and selected_format.isdigit():
+                quality_to_use = selected_format
+            
+            if selected_format and not selected_format.isdigit():
+                file_prefix = get_work_file_prefix(selected_format)
+            else:
+                file_prefix = get_work_file_prefix(get_audio_format_spec(output_format, quality_to_use))
+            temp_output = os.path.join(temp_dir, f"{file_prefix}.%(ext)s")
+            
+            if selected_format and not selected_format.isdigit():
+                ydl_opts = {
+                    'format': selected_format,
+                    'outtmpl': temp_output,
+                    'ffmpeg_location': ffmpeg_path,
+                    'noplaylist': True,
+                    'no_warnings': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+            else:
+                ydl_opts = {
+                    'format': get_audio_format_spec(output_format, quality_to_use),
+                    'outtmpl': temp_output,
+                    'ffmpeg_location': ffmpeg_path,
+                    'noplaylist': True,
+                    'no_warnings': True,
+                    'progress_hooks': progress_hooks,
+                    **get_network_ydl_opts()
+                }
+            
+            set_status("🎵 Downloading audio...")
+            timings['network_started_at'] = time.perf_counter()
+            
+            try:
+                with pooled_ydl(ydl_opts) as ydl:
+                    download_with_cached_info(ydl, url)
+            except Exception as download_error:
+                set_status("⚠️ Standard audio download failed, trying fallback...")
+                file_size = download_as_audio_fallback(url, ffmpeg_path, temp_dir, progress_callback, download_error, priority, quality_to_use, output_folder)
+                work_dir_done = file_size > 0
+                return file_size
+        
+        temp_files = list_finished_work_files(temp_dir, file_prefix)
+        if temp_files:
+            timings['network'] = time.perf_counter() - timings['network_started_at']
+            timings['download_bytes'] = os.path.getsize(os.path.join(temp_dir, temp_files[0]))
+            task = {
+                'ffmpeg_path': ffmpeg_path,
+                'temp_dir': temp_dir,
+                'temp_file': os.path.join(temp_dir, temp_files[0]),
+                'final_output': os.path.join(output_folder, f"{safe_title}.{output_format}"),
+                'format': output_format,
+                'quality': quality_to_use,
+                'preserve_metadata': preserve_metadata,
+                'progress_callback': progress_callback,
+                'safe_title': safe_title,
+                'uploader': uploader,
+                'upload_date': upload_date,
+                'duration': duration,
+                'timings': timings
+            }
+            
+            handed_off = True
+            if pipeline:
+                return pipeline.submit(task)
+            return transcode_downloaded_file(task)
+        
+        # yt-dlp returned without leaving a finished file; that is a failure, not an empty download
+        raise Exception("Download did not produce a file")
                     
     except Exception as e:
         print(f"Error in download_single_video: {e}")
         raise e
-    
-    return 0
+    finally:
+        if not handed_off:
+            if pipeline:
+                pipeline.release()
+            release_work_dir(temp_dir, remove=work_dir_done)
 
 def handle_download_error(e):
     error_msg = str(e).lower()
@@ -1502,10 +3300,8 @@ def handle_download_error(e):
     else:
         user_friendly_error = "Download failed! Please try again."
     
-    app.after(0, lambda: progress_bar.pack_forget())
-    app.after(0, lambda: status_label.configure(text=f"❌ {user_friendly_error}"))
-    format_display = current_format.upper()
-    app.after(0, lambda: button.configure(state="normal", text=f"📥 Download {format_display}", fg_color=("#238636", "#238636")))
+    set_status(f"❌ {user_friendly_error}")
+    post_ui(reset_download_controls)
     print(f"Error: {e}")
 
 def indir_sadece_ses(url):
@@ -1557,13 +3353,13 @@ def indir_sadece_ses(url):
     
     button.configure(state="disabled", text="⬇️ Downloading...", fg_color=("#6f42c1", "#6f42c1"))
     
+    hide_job_list()
     progress_bar.pack(pady=(10, 0))
     status_label.configure(text="🚀 Starting download...")
-    progress_bar.set(0.1)
+    progress_bar.set(0)
     
-    download_thread_obj = threading.Thread(target=download_thread, args=(url,))
-    download_thread_obj.daemon = True
-    download_thread_obj.start()
+    run_in_orchestrator(download_task(url))
+
 
 def is_playlist_url(url):
     playlist_patterns = [
@@ -1582,74 +3378,103 @@ def is_playlist_url(url):
     
     return False
 
-def get_playlist_info(url):
-    try:
-        ydl_opts = {
-            'quiet': True, 
-            'extract_flat': True,
-            'no_warnings': True,
-            'ignoreerrors': True,
-            'socket_timeout': 60,
+def extract_playlist_id(url):
+    match = re.search(r'[?&]list=([a-zA-Z0-9_-]+)', url)
+    if match:
+        return match.group(1)
+    return None
+
+def load_cached_playlist_info(url, reported_count=None):
+    """Cached entries for the playlist; pass the video count yt-dlp reports now to reject a cache of a changed playlist"""
+    playlist_id = extract_playlist_id(url)
+    if not playlist_id:
+        return None
+    
+    cached = load_cached_metadata(f"playlist:{playlist_id}", PLAYLIST_METADATA_FIELDS)
+    if cached and reported_count is not None and cached['reported_count'] != reported_count:
+        print(f"Playlist changed ({cached['reported_count']} -> {reported_count} videos), refreshing cache")
+        return None
+    if cached and cached['entries']:
+        return {
+            'title': cached['title'],
+            'count': len(cached['entries']),
+            'entries': cached['entries']
         }
-        
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
-            info = ydl.extract_info(url, download=False)
-            
-            if info and 'entries' in info:
-                valid_entries = []
-                for entry in info['entries']:
-                    if entry is not None:
-                        if 'url' in entry:
-                            valid_entries.append({'url': entry['url']})
-                        elif 'id' in entry:
-                            entry_id = entry['id']
-                            if (len(entry_id) == 11 and 
-                                entry_id.replace('-', '').replace('_', '').isalnum() and
-                                not entry_id.startswith('PL') and  
-                                not entry_id.startswith('UC') and  
-                                not entry_id.startswith('UU')):   
-                                valid_entries.append({'id': entry_id})
-                            else:
-                                print(f"Skipping invalid video ID: {entry_id}")
-                        elif 'webpage_url' in entry:
-                            valid_entries.append({'url': entry['webpage_url']})
-                        elif 'ie_key' in entry and entry.get('ie_key') == 'Youtube':
-                            if 'title' in entry:
-                                print(f"Skipping entry with no URL/ID: {entry.get('title', 'Unknown')}")
-                
-                if valid_entries:
-                    return {
-                        'title': info.get('title', 'Unknown Playlist'),
-                        'count': len(valid_entries),
-                        'entries': valid_entries
-                    }
-                else:
-                    print("No valid entries with extract_flat, trying full extraction...")
-                    return get_playlist_info_full(url)
-            
-            if info and info.get('id'):
-                video_id = info.get('id')
-                if len(video_id) == 11 and not video_id.startswith(('PL', 'UC', 'UU')):
-                    return {
-                        'title': info.get('title', 'Single Video'),
-                        'count': 1,
-                        'entries': [{'id': video_id}]
-                    }
-                
-    except Exception as e:
-        print(f"Error getting playlist info: {e}")
-        try:
-            video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', url)
-            if video_id_match:
-                video_id = video_id_match.group(1)
-                if not video_id.startswith(('PL', 'UC', 'UU')):
-                    return {
-                        'title': 'Extracted Video',
-                        'count': 1,
-                        'entries': [{'id': video_id}]
-                    }                    
-        except Exception:
-            pass
+    return None
+
+def store_playlist_info(url, playlist_info, reported_count=None):
+    playlist_id = extract_playlist_id(url)
+    if playlist_id:
+        store_metadata(f"playlist:{playlist_id}", {
+            'title': playlist_info['title'],
+            'entries': playlist_info['entries'],
+            'reported_count': reported_count if reported_count is not None else len(playlist_info['entries'])
+        })
+
+def get_valid_playlist_entry(entry):
+    if entry is None:
+        return None
+    
+    if 'url' in entry:
+        return {'url': entry['url']}
+    elif 'id' in entry:
+        entry_id = entry['id']
+        if (len(entry_id) == 11 and 
+            entry_id.replace('-', '').replace('_', '').isalnum() and
+            not entry_id.startswith('PL') and  
+            not entry_id.startswith('UC') and  
+            not entry_id.startswith('UU')):   
+            return {'id': entry_id}
+        else:
+            print(f"Skipping invalid video ID: {entry_id}")
+    elif 'webpage_url' in entry:
+        return {'url': entry['webpage_url']}
+    elif 'ie_key' in entry and entry.get('ie_key') == 'Youtube':
+        if 'title' in entry:
+            print(f"Skipping entry with no URL/ID: {entry.get('title', 'Unknown')}")
+    
+    return None
+
+def get_playlist_info(url):
+    """Like get_playlist_stream, with every entry read into a list"""
+    playlist_info = get_playlist_stream(url)
+    if playlist_info is None or isinstance(playlist_info['entries'], list):
+        return playlist_info
+    
+    entries = list(playlist_info['entries'])
+    if not entries:
+        return None
+    return {
+        'title': playlist_info['title'],
+        'count': len(entries),
+        'entries': entries
+    }
+
+def get_playlist_fallback(url, info=None):
+    """Entries for a URL that could not be read as a playlist: the cached playlist (without a change
+    check, e.g. while offline) or the single video the URL or extraction points to"""
+    cached_playlist_info = load_cached_playlist_info(url)
+    if cached_playlist_info:
+        return cached_playlist_info
+    
+    if info and info.get('id'):
+        video_id = info.get('id')
+        if len(video_id) == 11 and not video_id.startswith(('PL', 'UC', 'UU')):
+            return {
+                'title': info.get('title', 'Single Video'),
+                'count': 1,
+                'entries': [{'id': video_id}]
+            }
+    
+    video_id_match = re.search(r'(?:v=|/)([a-zA-Z0-9_-]{11})', url)
+    if video_id_match:
+        video_id = video_id_match.group(1)
+        if not video_id.startswith(('PL', 'UC', 'UU')):
+            return {
+                'title': 'Extracted Video',
+                'count': 1,
+                'entries': [{'id': video_id}]
+            }
     
     return None
 
@@ -1662,7 +3487,7 @@ def get_playlist_info_full(url):
             'ignoreerrors': True,
         }
         
-        with yt_dlp.YoutubeDL(ydl_opts) as ydl:
+        with pooled_ydl(ydl_opts) as ydl:
             info = ydl.extract_info(url, download=False)
             
             if info and 'entries' in info:
@@ -1674,25 +3499,260 @@ def get_playlist_info_full(url):
                             valid_entries.append({'id': entry_id})
                 
                 if valid_entries:
-                    return {
+                    playlist_info = {
                         'title': info.get('title', 'Unknown Playlist'),
                         'count': len(valid_entries),
                         'entries': valid_entries
                     }
+                    store_playlist_info(url, playlist_info)
+                    return playlist_info
     except Exception as e:
         print(f"Full extraction fallback failed: {e}")
     
     return None
 
+PLAYLIST_PAGE_SIZE = 100
+PLAYLIST_REDIRECT_LIMIT = 3
+
+def open_playlist(url):
+    """Extract the playlist itself without walking its entries. Returns (ydl, info); info['entries']
+    fetches further pages as it is read, so the caller keeps ydl open until then and closes it after.
+    ydl is None when the URL is not a playlist"""
+    ydl_opts = {
+        'quiet': True,
+        'extract_flat': True,
+        'no_warnings': True,
+        'ignoreerrors': True,
+        'socket_timeout': 60,
+    }
+    
+    # Not pooled: the entries keep using this instance after it returns, from whichever worker pulls the next job
+    ydl = yt_dlp.YoutubeDL(ydl_opts)
+    try:
+        # process=False stops yt-dlp from enumerating every entry before extract_info returns
+        info = ydl.extract_info(url, download=False, process=False)
+        for _ in range(PLAYLIST_REDIRECT_LIMIT):
+            # watch?v=...&list=... and similar URLs first resolve to the playlist URL
+            if not info or info.get('_type') not in ['url', 'url_transparent']:
+                break
+            info = ydl.extract_info(info['url'], download=False, ie_key=info.get('ie_key'), process=False)
+    except Exception:
+        ydl.close()
+        raise
+    
+    if not info or 'entries' not in info:
+        ydl.close()
+        return None, info
+    return ydl, info
+
+def iterate_playlist_entries(entries):
+    """Raw entries of an unprocessed playlist, one page at a time; yt-dlp hands out a generator, a list or a PagedList"""
+    if not hasattr(entries, 'getslice'):
+        yield from entries
+        return
+    
+    index = 0
+    while True:
+        page = entries.getslice(index, index + PLAYLIST_PAGE_SIZE)
+        yield from page
+        if len(page) < PLAYLIST_PAGE_SIZE:
+            return
+        index += PLAYLIST_PAGE_SIZE
+
+def get_playlist_stream(url):
+    """Playlist title, count and entries; 'entries' is a generator that fetches playlist pages lazily
+    and 'count' is None unless the first page reports it. Unchanged playlists come from the cache as a list"""
+    try:
+        ydl, info = open_playlist(url)
+    except Exception as e:
+        print(f"Error getting playlist info: {e}")
+        return get_playlist_fallback(url)
+    
+    if ydl is None:
+        return get_playlist_fallback(url, info)
+    
+    # Only the first page has been fetched so far; its video count tells whether the cached entries are still current
+    if info.get('playlist_count') is not None:
+        cached_playlist_info = load_cached_playlist_info(url, info['playlist_count'])
+        if cached_playlist_info:
+            ydl.close()
+            return cached_playlist_info
+    
+    playlist_title = info.get('title', 'Unknown Playlist')
+    
+    def generate_entries():
+        valid_entries = []
+        try:
+            for entry in iterate_playlist_entries(info['entries']):
+                valid_entry = get_valid_playlist_entry(entry)
+                if valid_entry:
+                    valid_entries.append(valid_entry)
+                    yield valid_entry
+        except Exception as e:
+            print(f"Error reading playlist page: {e}")
+            return
+        finally:
+            ydl.close()
+        
+        if valid_entries:
+            store_playlist_info(url, {'title': playlist_title, 'count': len(valid_entries), 'entries': valid_entries}, info.get('playlist_count'))
+        else:
+            print("No valid entries with extract_flat, trying full extraction...")
+            playlist_info = get_playlist_info_full(url)
+            if playlist_info:
+                yield from playlist_info['entries']
+    
+    return {
+        'title': playlist_title,
+        'count': info.get('playlist_count'),
+        'entries': generate_entries()
+    }
+
+def load_playlist_sync_state(playlist_id):
+    try:
+        with metadata_cache_lock:
+            db = get_metadata_cache_db()
+            rows = db.execute("SELECT entry_id FROM playlist_sync WHERE playlist_id = ?", (playlist_id,))
+            return {row[0] for row in rows}
+    except Exception as e:
+        print(f"Error reading playlist sync state: {e}")
+    return set()
+
+def mark_playlist_entries_seen(url, video_urls):
+    playlist_id = extract_playlist_id(url)
+    entry_ids = [extract_video_id(video_url) for video_url in video_urls]
+    entry_ids = [entry_id for entry_id in entry_ids if entry_id]
+    if not playlist_id or not entry_ids:
+        return
+    
+    try:
+        with metadata_cache_lock:
+            db = get_metadata_cache_db()
+            now = time.time()
+            db.executemany(
+                "INSERT OR REPLACE INTO playlist_sync (playlist_id, entry_id, seen_at) VALUES (?, ?, ?)",
+                [(playlist_id, entry_id, now) for entry_id in entry_ids]
+            )
+            db.commit()
+    except Exception as e:
+        print(f"Error saving playlist sync state: {e}")
+
+def mark_synced_jobs_seen(jobs):
+    """Record finished entries of synced playlists so the next sync skips them"""
+    seen_by_playlist = {}
+    for job in jobs:
+        if job.sync_playlist_url and job.status in ["done", "skipped"]:
+            seen_by_playlist.setdefault(job.sync_playlist_url, []).append(job.url)
+    
+    for playlist_url, video_urls in seen_by_playlist.items():
+        mark_playlist_entries_seen(playlist_url, video_urls)
+
+def get_playlist_updates(url):
+    """Return only the entries not synced before. Paging stops after a page of consecutive known
+    entries, unless the playlist reports more videos than have been seen so far; then the whole
+    playlist is walked so videos added at the bottom are found too"""
+    playlist_id = extract_playlist_id(url)
+    seen_entries = load_playlist_sync_state(playlist_id) if playlist_id else set()
+    if not seen_entries:
+        return get_playlist_info(url)
+    
+    try:
+        ydl, info = open_playlist(url)
+        if ydl is None:
+            return get_playlist_info(url)
+        
+        try:
+            reported_count = info.get('playlist_count')
+            new_entries = []
+            scanned = 0
+            known_streak = 0
+            for entry in iterate_playlist_entries(info['entries']):
+                if entry is None:
+                    continue
+                scanned += 1
+                
+                entry_id = entry.get('id') or extract_video_id(entry.get('url') or '')
+                if not entry_id or len(entry_id) != 11 or entry_id.startswith(('PL', 'UC', 'UU')):
+                    continue
+                
+                if entry_id not in seen_entries:
+                    known_streak = 0
+                    new_entries.append({'id': entry_id})
+                    continue
+                
+                known_streak += 1
+                unaccounted = reported_count is not None and reported_count > len(seen_entries) + len(new_entries)
+                if known_streak >= PLAYLIST_PAGE_SIZE and not unaccounted:
+                    break
+        finally:
+            ydl.close()
+        
+        print(f"Playlist sync scanned {scanned} entries, {len(new_entries)} new")
+        return {
+            'title': info.get('title', 'Unknown Playlist'),
+            'count': len(new_entries),
+            'entries': new_entries
+        }
+    except Exception as e:
+        print(f"Error syncing playlist: {e}")
+    
+    return get_playlist_info(url)
+
+STATS_SAVE_DELAY = 2.0
+STATS_SERIES_MAX = 200
+STATS_PHASES = ["extract", "network", "transcode"]
+
+stats_lock = threading.Lock()
+stats_save_timer = None
+stats_dirty = False
+
+def make_empty_stats():
+    return {
+        "total_downloads": 0,
+        "total_size_mb": 0,
+        "total_content_seconds": 0,
+        "total_download_bytes": 0,
+        "total_wall_seconds": 0,
+        "phase_seconds": {phase: 0 for phase in STATS_PHASES},
+        "formats": {},
+        "recent": []
+    }
+
+download_stats = make_empty_stats()
+
 def save_download_stats():
+    """Write the stats atomically so a crash mid-write never leaves a truncated file"""
+    global stats_save_timer, stats_dirty
     try:
+        with stats_lock:
+            stats_save_timer = None
+            if not stats_dirty:
+                return
+            stats_dirty = False
+            data = json.dumps(download_stats)
+        
         app_data_dir = get_app_data_dir()
         stats_file = os.path.join(app_data_dir, "download_stats.json")
-        with open(stats_file, 'w') as f:
-            json.dump(download_stats, f)
+        temp_file = stats_file + ".tmp"
+        with open(temp_file, 'w') as f:
+            f.write(data)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_file, stats_file)
     except Exception as e:
         print(f"Error saving stats: {e}")
 
+def schedule_stats_save():
+    """Coalesce the saves of a burst of finished downloads into one write; call with stats_lock held"""
+    global stats_save_timer, stats_dirty
+    stats_dirty = True
+    if stats_save_timer is None:
+        stats_save_timer = threading.Timer(STATS_SAVE_DELAY, save_download_stats)
+        stats_save_timer.daemon = True
+        stats_save_timer.start()
+
+atexit.register(save_download_stats)
+
 def load_download_stats():
     global download_stats
     try:
@@ -1700,21 +3760,88 @@ def load_download_stats():
         stats_file = os.path.join(app_data_dir, "download_stats.json")
         if os.path.exists(stats_file):
             with open(stats_file, 'r') as f:
-                download_stats = json.load(f)
+                loaded_stats = json.load(f)
+            
+            # "total_time_saved" always held the summed video duration
+            if "total_time_saved" in loaded_stats:
+                loaded_stats["total_content_seconds"] = loaded_stats.pop("total_time_saved")
+            
+            stats = make_empty_stats()
+            stats.update(loaded_stats)
+            for phase in STATS_PHASES:
+                stats["phase_seconds"].setdefault(phase, 0)
+            with stats_lock:
+                download_stats = stats
     except Exception as e:
         print(f"Error loading stats: {e}")
 
-def update_download_stats(file_size_mb, duration_seconds):
-    global download_stats
-    download_stats["total_downloads"] += 1
-    download_stats["total_size_mb"] += file_size_mb
-    download_stats["total_time_saved"] += duration_seconds
-    save_download_stats()
+def update_download_stats(file_size_mb, duration_seconds, output_format=None, timings=None):
+    timings = timings or {}
+    download_bytes = timings.get('download_bytes', 0)
+    phase_seconds = {phase: timings.get(phase, 0) for phase in STATS_PHASES}
+    wall_seconds = timings.get('wall', sum(phase_seconds.values()))
+    network_seconds = phase_seconds["network"]
+    mb_per_sec = download_bytes / (1024 * 1024) / network_seconds if network_seconds > 0 else 0
+    
+    with stats_lock:
+        download_stats["total_downloads"] += 1
+        download_stats["total_size_mb"] += file_size_mb
+        download_stats["total_content_seconds"] += duration_seconds or 0
+        download_stats["total_download_bytes"] += download_bytes
+        download_stats["total_wall_seconds"] += wall_seconds
+        for phase, seconds in phase_seconds.items():
+            download_stats["phase_seconds"][phase] += seconds
+        
+        if output_format:
+            format_stats = download_stats["formats"].setdefault(output_format, {
+                "downloads": 0, "size_mb": 0, "download_bytes": 0, "network_seconds": 0, "wall_seconds": 0
+            })
+            format_stats["downloads"] += 1
+            format_stats["size_mb"] += file_size_mb
+            format_stats["download_bytes"] += download_bytes
+            format_stats["network_seconds"] += network_seconds
+            format_stats["wall_seconds"] += wall_seconds
+        
+        download_stats["recent"].append({
+            "time": round(time.time()),
+            "format": output_format,
+            "size_mb": round(file_size_mb, 3),
+            "download_bytes": download_bytes,
+            "wall_seconds": round(wall_seconds, 3),
+            "mb_per_sec": round(mb_per_sec, 3),
+            **{phase: round(seconds, 3) for phase, seconds in phase_seconds.items()}
+        })
+        del download_stats["recent"][:-STATS_SERIES_MAX]
+        schedule_stats_save()
+
+def get_throughput_summary():
+    """Average network MB/s overall, per format and over the recent jobs"""
+    with stats_lock:
+        network_seconds = download_stats["phase_seconds"]["network"]
+        summary = {
+            'overall': download_stats["total_download_bytes"] / (1024 * 1024) / network_seconds if network_seconds else 0,
+            'formats': {},
+            'recent': [entry["mb_per_sec"] for entry in download_stats["recent"]]
+        }
+        for output_format, format_stats in download_stats["formats"].items():
+            summary['formats'][output_format] = {
+                'downloads': format_stats["downloads"],
+                'size_mb': format_stats["size_mb"],
+                'mb_per_sec': format_stats["download_bytes"] / (1024 * 1024) / format_stats["network_seconds"] if format_stats["network_seconds"] else 0
+            }
+    return summary
+
+def make_sparkline(values):
+    if not values:
+        return ""
+    blocks = "▁▂▃▄▅▆▇█"
+    peak = max(values) or 1
+    return "".join(blocks[min(len(blocks) - 1, int(value / peak * (len(blocks) - 1)))] for value in values)
 
 def open_history_window():
     history_window = tk.CTkToplevel(app)
     history_window.title("📜 Download History")
-    history_window.geometry("700x500")
+    history_window.geometry("750x600")
     history_window.configure(fg_color=("#0d1117", "#0d1117"))
     history_window.transient(app)
     history_window.grab_set()
@@ -1727,54 +3854,182 @@ def open_history_window():
     )
     header.pack(pady=(20, 30))
     
-    if not download_history:
-        no_history_label = tk.CTkLabel(
-            history_window,
-            text="No downloads yet! 🎵",
-            font=tk.CTkFont(size=16),
-            text_color=("#8b949e", "#8b949e")
+    filter_frame = tk.CTkFrame(history_window, fg_color="transparent")
+    filter_frame.pack(fill="x", padx=20, pady=(0, 10))
+    
+    search_entry = tk.CTkEntry(
+        filter_frame,
+        placeholder_text="🔍 Search title...",
+        height=35,
+        font=tk.CTkFont(size=13),
+        fg_color=("#21262d", "#21262d"),
+        border_color=("#30363d", "#30363d")
+    )
+    search_entry.pack(side="left", fill="x", expand=True, padx=(0, 10))
+    
+    date_entry = tk.CTkEntry(
+        filter_frame,
+        placeholder_text="📅 YYYY-MM-DD",
+        width=130,
+        height=35,
+        font=tk.CTkFont(size=13),
+        fg_color=("#21262d", "#21262d"),
+        border_color=("#30363d", "#30363d")
+    )
+    date_entry.pack(side="left", padx=(0, 10))
+    
+    all_formats_label = "All formats"
+    format_var = tk.StringVar(value=all_formats_label)
+    format_menu = tk.CTkOptionMenu(
+        filter_frame,
+        values=[all_formats_label] + get_history_formats(),
+        variable=format_var,
+        command=lambda _: reload_history(),
+        width=150,
+        height=35,
+        font=tk.CTkFont(size=13),
+        fg_color=("#21262d", "#21262d"),
+        button_color=("#30363d", "#30363d"),
+        button_hover_color=("#58a6ff", "#58a6ff")
+    )
+    format_menu.pack(side="left")
+    
+    count_label = tk.CTkLabel(
+        history_window,
+        text="",
+        font=tk.CTkFont(size=12),
+        text_color=("#8b949e", "#8b949e")
+    )
+    count_label.pack(padx=20, anchor="w")
+    
+    page_frame = tk.CTkFrame(history_window, fg_color="transparent")
+    page_frame.pack(side="bottom", pady=(0, 20))
+    
+    prev_button = tk.CTkButton(
+        page_frame,
+        text="⬅️ Newer",
+        command=lambda: show_previous_page(),
+        width=110,
+        height=32,
+        font=tk.CTkFont(size=13),
+        fg_color=("#21262d", "#21262d"),
+        hover_color=("#30363d", "#30363d")
+    )
+    prev_button.pack(side="left", padx=10)
+    
+    page_label = tk.CTkLabel(
+        page_frame,
+        text="",
+        font=tk.CTkFont(size=12),
+        text_color=("#8b949e", "#8b949e")
+    )
+    page_label.pack(side="left", padx=10)
+    
+    next_button = tk.CTkButton(
+        page_frame,
+        text="Older ➡️",
+        command=lambda: show_next_page(),
+        width=110,
+        height=32,
+        font=tk.CTkFont(size=13),
+        fg_color=("#21262d", "#21262d"),
+        hover_color=("#30363d", "#30363d")
+    )
+    next_button.pack(side="left", padx=10)
+    
+    scrollable_frame = tk.CTkScrollableFrame(
+        history_window,
+        width=650,
+        height=350,
+        corner_radius=15,
+        fg_color=("#161b22", "#161b22")
+    )
+    scrollable_frame.pack(padx=20, pady=(0, 10), fill="both", expand=True)
+    
+    # Only one page of rows exists at a time; each page starts below the last id of the page before it
+    page_state = {'page_starts': [None], 'last_id': None, 'total': 0, 'filters': {}, 'search_id': None}
+    
+    def add_history_row(item):
+        item_frame = tk.CTkFrame(
+            scrollable_frame,
+            corner_radius=10,
+            fg_color=("#21262d", "#21262d")
         )
-        no_history_label.pack(pady=50)
-    else:
-        scrollable_frame = tk.CTkScrollableFrame(
-            history_window,
-            width=650,
-            height=350,
-            corner_radius=15,
-            fg_color=("#161b22", "#161b22")
+        item_frame.pack(fill="x", padx=10, pady=5)
+        
+        title_label = tk.CTkLabel(
+            item_frame,
+            text=f"🎵 {item['title']}",
+            font=tk.CTkFont(size=14, weight="bold"),
+            text_color=("#f0f6fc", "#f0f6fc"),
+            anchor="w"
         )
-        scrollable_frame.pack(padx=20, pady=(0, 20), fill="both", expand=True)
+        title_label.pack(fill="x", padx=15, pady=(10, 5))
         
-        for i, item in enumerate(download_history):
-            item_frame = tk.CTkFrame(
-                scrollable_frame,
-                corner_radius=10,
-                fg_color=("#21262d", "#21262d")
-            )
-            item_frame.pack(fill="x", padx=10, pady=5)
-            
-            title_label = tk.CTkLabel(
-                item_frame,
-                text=f"🎵 {item['title']}",
-                font=tk.CTkFont(size=14, weight="bold"),
-                text_color=("#f0f6fc", "#f0f6fc"),
-                anchor="w"
-            )
-            title_label.pack(fill="x", padx=15, pady=(10, 5))
-            
-            details_label = tk.CTkLabel(
-                item_frame,
-                text=f"Format: {item['format']} | Downloaded: {item['timestamp']}",
-                font=tk.CTkFont(size=12),
-                text_color=("#8b949e", "#8b949e"),
-                anchor="w"
-            )
-            details_label.pack(fill="x", padx=15, pady=(0, 10))
+        details_label = tk.CTkLabel(
+            item_frame,
+            text=f"Format: {item['format']} | Downloaded: {item['timestamp']}",
+            font=tk.CTkFont(size=12),
+            text_color=("#8b949e", "#8b949e"),
+            anchor="w"
+        )
+        details_label.pack(fill="x", padx=15, pady=(0, 10))
+    
+    def load_history_page():
+        for child in scrollable_frame.winfo_children():
+            child.destroy()
+        
+        items = search_download_history(before_id=page_state['page_starts'][-1], **page_state['filters'])
+        for item in items:
+            add_history_row(item)
+        page_state['last_id'] = items[-1]['id'] if items else None
+        
+        page = len(page_state['page_starts'])
+        pages = max(1, (page_state['total'] + HISTORY_PAGE_SIZE - 1) // HISTORY_PAGE_SIZE)
+        page_label.configure(text=f"Page {page} of {pages}")
+        prev_button.configure(state="normal" if page > 1 else "disabled")
+        next_button.configure(state="normal" if page < pages and page_state['last_id'] is not None else "disabled")
+    
+    def show_next_page():
+        page_state['page_starts'].append(page_state['last_id'])
+        load_history_page()
+    
+    def show_previous_page():
+        if len(page_state['page_starts']) > 1:
+            page_state['page_starts'].pop()
+            load_history_page()
+    
+    def reload_history():
+        page_state['search_id'] = None
+        selected_format = format_var.get()
+        page_state['filters'] = {
+            'search_text': search_entry.get().strip(),
+            'format_filter': selected_format if selected_format != all_formats_label else None,
+            'date_prefix': date_entry.get().strip()
+        }
+        page_state['page_starts'] = [None]
+        
+        total = count_download_history(**page_state['filters'])
+        page_state['total'] = total
+        if total == 0 and not any(page_state['filters'].values()):
+            count_label.configure(text="No downloads yet! 🎵")
+        else:
+            count_label.configure(text=f"{total} downloads")
+        load_history_page()
+    
+    def schedule_reload(event=None):
+        if page_state['search_id'] is not None:
+            history_window.after_cancel(page_state['search_id'])
+        page_state['search_id'] = history_window.after(300, reload_history)
+    
+    search_entry.bind("<KeyRelease>", schedule_reload)
+    date_entry.bind("<KeyRelease>", schedule_reload)
+    reload_history()
 
 def open_stats_window():
     stats_window = tk.CTkToplevel(app)
     stats_window.title("📊 Download Statistics")
-    stats_window.geometry("500x400")
+    stats_window.geometry("560x640")
     stats_window.configure(fg_color=("#0d1117", "#0d1117"))
     stats_window.transient(app)
     stats_window.grab_set()
@@ -1811,7 +4066,7 @@ def open_stats_window():
     )
     size_label.pack(pady=10)
     
-    hours = download_stats['total_time_saved'] / 3600
+    hours = download_stats['total_content_seconds'] / 3600
     time_label = tk.CTkLabel(
         stats_frame,
         text=f"⏰ Content Downloaded: {hours:.1f} hours",
@@ -1819,6 +4074,58 @@ def open_stats_window():
         text_color=("#f0f6fc", "#f0f6fc")
     )
     time_label.pack(pady=10)
+    
+    throughput = get_throughput_summary()
+    throughput_label = tk.CTkLabel(
+        stats_frame,
+        text=f"🚀 Average Speed: {throughput['overall']:.2f} MB/s",
+        font=tk.CTkFont(size=16),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    throughput_label.pack(pady=10)
+    
+    phase_seconds = download_stats['phase_seconds']
+    phase_total = sum(phase_seconds.values()) or 1
+    phase_label = tk.CTkLabel(
+        stats_frame,
+        text=f"⏱️ Time Split: {phase_seconds['extract'] / phase_total:.0%} extract | "
+             f"{phase_seconds['network'] / phase_total:.0%} network | "
+             f"{phase_seconds['transcode'] / phase_total:.0%} transcode",
+        font=tk.CTkFont(size=14),
+        text_color=("#8b949e", "#8b949e")
+    )
+    phase_label.pack(pady=10)
+    
+    format_lines = [
+        f"{output_format.upper()}: {format_stats['downloads']} files, {format_stats['size_mb'] / 1024:.2f} GB, {format_stats['mb_per_sec']:.2f} MB/s"
+        for output_format, format_stats in sorted(throughput['formats'].items())
+    ]
+    formats_label = tk.CTkLabel(
+        stats_frame,
+        text="\n".join(format_lines) or "No per-format data yet",
+        font=tk.CTkFont(size=13),
+        text_color=("#8b949e", "#8b949e"),
+        justify="left"
+    )
+    formats_label.pack(pady=10)
+    
+    recent_speeds = throughput['recent'][-40:]
+    sparkline_label = tk.CTkLabel(
+        stats_frame,
+        text=f"📈 Last {len(recent_speeds)} downloads: {make_sparkline(recent_speeds)}" if recent_speeds else "📈 No recent downloads",
+        font=tk.CTkFont(size=14),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    sparkline_label.pack(pady=10)
+    
+    cache_stats = get_metadata_cache_stats()
+    cache_label = tk.CTkLabel(
+        stats_frame,
+        text=f"🗄️ Metadata Cache: {cache_stats['hits']} hits, {cache_stats['misses']} misses",
+        font=tk.CTkFont(size=16),
+        text_color=("#f0f6fc", "#f0f6fc")
+    )
+    cache_label.pack(pady=10)
 
 def create_context_menu():
     def paste_url():
@@ -1830,6 +4137,7 @@ def create_context_menu():
                 if 'youtube.com' in clipboard_data or 'youtu.be' in clipboard_data:
                     textbox.configure(border_color=("#238636", "#238636"))
                     status_label.configure(text="✅ URL pasted!")
+                    prefetch_pasted_urls(clipboard_data)
                 else:
                     textbox.configure(border_color=("#f85149", "#f85149"))
                     status_label.configure(text="❌ Not a YouTube URL")
@@ -1889,15 +4197,26 @@ def create_context_menu():
     textbox.bind("<Button-3>", show_context_menu)
 
 if __name__ == "__main__":
+    mark_startup_phase("imports")
+    
+    import customtkinter as tk
+    from tkinter import filedialog, messagebox
+    
     tk.set_appearance_mode("dark")
     tk.set_default_color_theme("blue")
+    mark_startup_phase("gui_imports")
     
     load_settings_from_file()
+    mark_startup_phase("settings")
     
     load_download_stats()
     load_download_history()
+    mark_startup_phase("stats_and_history")
     
-    cleanup_old_data_files()
+    threading.Thread(target=cleanup_old_data_files, daemon=True).start()
+    threading.Thread(target=cleanup_partial_downloads, daemon=True).start()
+    unfinished_runs = load_unfinished_journal_runs()
+    mark_startup_phase("job_journal")
     
     app = tk.CTk()
     app.title("🎵 YouTube MP3 Converter")
@@ -2027,6 +4346,7 @@ if __name__ == "__main__":
                 if 'youtube.com' in clipboard_data or 'youtu.be' in clipboard_data:
                     textbox.configure(border_color=("#238636", "#238636"))
                     status_label.configure(text="✅ URL pasted from clipboard!")
+                    prefetch_pasted_urls(clipboard_data)
                 else:
                     textbox.configure(border_color=("#f85149", "#f85149"))
                     status_label.configure(text="❌ Not a YouTube URL")
@@ -2072,11 +4392,27 @@ if __name__ == "__main__":
     )
     progress_bar.set(0)
     
+    job_list_box = tk.CTkTextbox(
+        status_frame,
+        height=130,
+        corner_radius=10,
+        font=tk.CTkFont(size=12),
+        fg_color=("#161b22", "#161b22"),
+        text_color=("#8b949e", "#8b949e"),
+        state="disabled"
+    )
+    
     app.bind('<Control-v>', lambda e: textbox.focus())
     app.bind('<Return>', lambda e: indir_sadece_ses(textbox.get("0.0", "end-1c").strip()))
     app.bind('<Escape>', lambda e: app.quit())
     
     if clipboard_monitoring:
         start_clipboard_monitoring()
+    
+    mark_startup_phase("window")
+    
+    app.after(0, on_first_frame)
+    app.after(UI_REFRESH_INTERVAL_MS, refresh_ui)
+    app.after(1000, lambda: offer_to_resume_unfinished_runs(unfinished_runs))
         
     app.mainloop()
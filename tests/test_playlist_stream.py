@@ -0,0 +1,67 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import types
+
+import yt_dlp
+from yt_dlp.extractor.common import InfoExtractor
+
+import main
+
+PLAYLIST_URL = "https://playlist.test/playlist?list=PLpagedtest"
+
+fetched_pages = []
+reported_counts = [15]
+
+class FakePagedIE(InfoExtractor):
+    _VALID_URL = r'https://playlist\.test/playlist\?list=(?P<id>\w+)'
+    
+    def _real_extract(self, url):
+        def entries():
+            for page in range(5):
+                fetched_pages.append(page)
+                for index in range(3):
+                    yield self.url_result(f"https://www.youtube.com/watch?v=vid{page}{index:07d}", 'Youtube')
+        return self.playlist_result(entries(), self._match_id(url), 'Paged playlist', playlist_count=reported_counts[0])
+
+class FakeYoutubeDL(yt_dlp.YoutubeDL):
+    def __init__(self, params=None, auto_init=True):
+        super().__init__(params, auto_init=False)
+        self.add_info_extractor(FakePagedIE())
+
+def use_fake_playlist(tmp_path, monkeypatch):
+    monkeypatch.setenv('HOME', str(tmp_path))
+    monkeypatch.setattr(main, 'yt_dlp', types.SimpleNamespace(YoutubeDL=FakeYoutubeDL))
+    monkeypatch.setattr(main, 'metadata_cache_db', None)
+    fetched_pages.clear()
+    reported_counts[0] = 15
+
+def test_playlist_pages_are_fetched_as_entries_are_read(tmp_path, monkeypatch):
+    use_fake_playlist(tmp_path, monkeypatch)
+    
+    playlist_info = main.get_playlist_stream(PLAYLIST_URL)
+    assert playlist_info['count'] == 15
+    assert fetched_pages == []
+    
+    assert next(playlist_info['entries']) == {'url': "https://www.youtube.com/watch?v=vid00000000"}
+    assert fetched_pages == [0]
+    
+    assert len(list(playlist_info['entries'])) == 14
+    assert fetched_pages == [0, 1, 2, 3, 4]
+
+def test_cached_playlist_is_used_only_while_its_count_matches(tmp_path, monkeypatch):
+    use_fake_playlist(tmp_path, monkeypatch)
+    assert len(main.get_playlist_info(PLAYLIST_URL)['entries']) == 15
+    
+    fetched_pages.clear()
+    playlist_info = main.get_playlist_info(PLAYLIST_URL)
+    assert len(playlist_info['entries']) == 15
+    assert fetched_pages == []
+    
+    reported_counts[0] = 16
+    playlist_info = main.get_playlist_stream(PLAYLIST_URL)
+    assert not isinstance(playlist_info['entries'], list)
+    assert len(list(playlist_info['entries'])) == 15
+    assert fetched_pages == [0, 1, 2, 3, 4]
@@ -0,0 +1,53 @@
+import os
+import sys
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import main
+
+def make_info():
+    formats = []
+    for format_id, height, ext in [('18', 360, 'mp4'), ('22', 720, 'mp4'), ('137', 1080, 'mp4')]:
+        formats.append({
+            'format_id': format_id,
+            'url': f"https://example.com/{format_id}.{ext}",
+            'ext': ext,
+            'height': height,
+            'width': height * 16 // 9,
+            'vcodec': 'avc1',
+            'acodec': 'mp4a',
+            'protocol': 'https'
+        })
+    return {
+        'id': 'abcdefghijk',
+        'title': 'Pooled session test',
+        'extractor': 'generic',
+        'extractor_key': 'Generic',
+        'webpage_url': 'https://example.com/watch',
+        'formats': formats
+    }
+
+def select_format(overrides):
+    with main.pooled_ydl(dict(overrides, quiet=True, no_warnings=True)) as ydl:
+        return ydl.process_ie_result(make_info(), download=False)['format_id']
+
+def test_pooled_session_uses_requested_format():
+    assert select_format({'format': '18'}) == '18'
+    assert select_format({'format': '22'}) == '22'
+    assert select_format({}) == '137'
+
+def test_pooled_session_resets_postprocessors():
+    postprocessors = [{'key': 'FFmpegExtractAudio', 'preferredcodec': 'mp3'}]
+    with main.pooled_ydl({'quiet': True, 'postprocessors': postprocessors}) as ydl:
+        assert [type(pp).__name__ for pp in ydl._pps['post_process']] == ['FFmpegExtractAudioPP']
+    
+    with main.pooled_ydl({'quiet': True}) as ydl:
+        assert ydl._pps['post_process'] == []
+        assert ydl.format_selector is None
+
+def test_pooled_session_is_rebuilt_for_other_socket_timeout():
+    with main.pooled_ydl({'quiet': True}) as ydl:
+        assert ydl._request_director.handlers['Urllib'].timeout != 60
+    
+    with main.pooled_ydl({'quiet': True, 'socket_timeout': 60}) as ydl:
+        assert ydl._request_director.handlers['Urllib'].timeout == 60